@@ -1,9 +1,10 @@
+import asyncio
 import time
-from typing import Union
+from typing import Optional, Union
 
-import httpx
-from nonebot import on_message
+from nonebot import get_driver, on_message
 from nonebot.adapters import Event, Message
+from nonebot.adapters.onebot.v11 import MessageSegment
 from nonebot.adapters.onebot.v11.bot import Bot
 from nonebot.adapters.onebot.v11.event import GroupMessageEvent, PrivateMessageEvent
 from nonebot.adapters.onebot.v11.exception import ActionFailed
@@ -14,15 +15,81 @@ from nonebot.params import ArgPlainText, CommandArg
 from nonebot.rule import Rule, command
 from nonebot.typing import T_State
 
-from .ban_judge import check_text
+from .ban_judge import (
+    add_update_listener,
+    check_executor,
+    check_text,
+    check_text_async,
+    verdict_cache,
+    warm_up,
+)
 from .config import env_config, global_config, local_config
 from .data import NoticeType, data, save_data
-from .ocr import local_ocr, online_ocr
+from .ocr import (
+    DecodedImage,
+    ImageFetchError,
+    ImageRejectedError,
+    ImageTooLargeError,
+    OcrEngineLoadingError,
+    OcrUnavailableError,
+    chain_ocr,
+    close_fetch_client,
+    close_online_ocr_client,
+    decode_image_async,
+    fetch_image,
+    find_similar_image,
+    may_contain_text,
+    ocr_executor,
+    qr_scanner,
+    refresh_ocr_workers,
+    remember_image,
+    scan_qr_codes,
+    set_early_exit,
+    start_ocr_warm_up,
+    wait_ocr_engine,
+)
 from .utils.cache import cache_exists, load_cache, save_cache
 from .utils.constants import PrefixConstants
 from .utils.log import log
+from .utils.singleflight import SingleFlight
 
 su = global_config.superusers
+driver = get_driver()
+# 正在下载或识别的图片，按图片文件名合并并发请求
+image_flights: SingleFlight[Optional[str]] = SingleFlight()
+# 延后判定的图片识别任务
+deferred_tasks: set[asyncio.Task] = set()
+
+if env_config.ocr_early_exit:
+    # 长图逐块识别，已识别部分命中违禁词后不再识别剩余部分
+    set_early_exit(lambda text: bool(check_text(text)), lambda: verdict_cache.version)
+    # OCR工作进程中的匹配结构随词库更新重建
+    add_update_listener(refresh_ocr_workers)
+_warm_up_task = None
+
+
+@driver.on_startup
+async def warm_up_detector():
+    """在后台线程中预热检测用的分词词典，不阻塞启动"""
+    global _warm_up_task
+    _warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+
+
+@driver.on_startup
+async def warm_up_ocr_engine():
+    """在后台加载本地OCR模型，加载完成前图片由其他OCR后端处理"""
+    start_ocr_warm_up()
+
+
+@driver.on_shutdown
+async def shutdown_check_executor():
+    """关闭检测和OCR使用的线程池/进程池以及在线OCR、图片下载的连接池"""
+    for task in deferred_tasks:
+        task.cancel()
+    check_executor.shutdown()
+    ocr_executor.shutdown()
+    await close_online_ocr_client()
+    await close_fetch_client()
 
 
 def group_detection_enabled() -> Rule:
@@ -91,18 +158,389 @@ group_detect_turn_off = on_message(
 # ):
 
 
+async def recognize_image_segment(
+    segment: MessageSegment, limit: asyncio.Semaphore
+) -> Optional[str]:
+    """获取单个图片消息段的OCR结果和二维码内容，优先使用缓存
+
+    多个群同时发送同一张图片时，只下载和识别一次，其余消息等待同一个结果
+
+    Args:
+        segment: 图片消息段
+        limit: 限制同一条消息中同时处理的图片数
+
+    Returns:
+        OCR结果与二维码内容，图片信息缺失、下载或识别失败时返回None
+    """
+    # 获取图片标识信息
+    image_name = segment.data.get("file", "")
+    image_url = segment.data.get("url", "")
+    if not image_name or not image_url:
+        log.error(f"无法获取图片信息: {segment}")
+        return None
+    return await image_flights.do(
+        image_name, lambda: _recognize_image(image_name, image_url, limit)
+    )
+
+
+def load_cached_text(cache_key: str) -> Optional[str]:
+    """
+    读取缓存的识别结果
+
+    Args:
+        cache_key: 缓存键
+
+    Returns:
+        缓存的文本，没有缓存时返回None
+    """
+    if not cache_exists(cache_key):
+        return None
+    cached_result = load_cache(cache_key)
+    if not cached_result:
+        log.error("缓存存在但无法获取/不该出现")
+        return None
+    return cached_result
+
+
+def join_image_texts(ocr_text: str, qr_text: str) -> str:
+    """拼接图片的OCR结果和二维码内容，没有二维码时只返回OCR结果"""
+    if not qr_text.strip():
+        return ocr_text
+    return ocr_text + qr_text.lstrip() if ocr_text else qr_text
+
+
+async def _recognize_image(
+    image_name: str, image_url: str, limit: asyncio.Semaphore
+) -> Optional[str]:
+    """下载并识别图片的文字和二维码，由 recognize_image_segment 合并并发调用"""
+    # 图片数据的缓存键
+    image_data_cache_key = f"{PrefixConstants.QQ_RAW_PICTURE}{image_name}"
+    # OCR结果的缓存键
+    ocr_result_cache_key = f"{PrefixConstants.OCR_RESULT_TEXT}{image_name}"
+    # 二维码内容的缓存键
+    qr_result_cache_key = f"{PrefixConstants.QR_RESULT_TEXT}{image_name}"
+
+    # 先检查缓存中是否有结果
+    ocr_text = load_cached_text(ocr_result_cache_key)
+    qr_text = load_cached_text(qr_result_cache_key) if qr_scanner.enabled else " "
+    if ocr_text is not None and qr_text is not None:
+        log.info(f"使用缓存的识别结果: {image_name}")
+        log.debug(f"缓存的识别结果: {ocr_text} {qr_text}")
+        # 直接使用缓存的结果
+        return join_image_texts(ocr_text, qr_text)
+
+    # 没有缓存，进行识别
+    async with limit:
+        if cache_exists(image_data_cache_key):
+            image_data = load_cache(image_data_cache_key)
+        else:
+            # 边下载边写入缓存，过大或不是图片时提前中止
+            try:
+                image_data = await fetch_image(
+                    image_url, image_data_cache_key, env_config.image_max_bytes
+                )
+            except ImageRejectedError as e:
+                log.warning(f"跳过图片 {image_name}: {e}")
+                return ""
+            except ImageFetchError as e:
+                log.error(str(e))
+                return None
+
+        # 只解码一次，供二维码检测、相似图片查找和文字判断共用
+        try:
+            decoded = await decode_image_async(image_data)
+        except ImageTooLargeError as e:
+            log.warning(f"跳过图片 {image_name}: {e}")
+            return ""
+
+        if qr_text is None:
+            # 二维码内容与OCR结果分开缓存
+            qr_text = await scan_qr_codes(decoded)
+            save_cache(qr_result_cache_key, qr_text, PrefixConstants.OCR_CACHE_TTL)
+            if (
+                env_config.ocr_early_exit
+                and qr_text.strip()
+                and await check_text_async(qr_text)
+            ):
+                log.info(f"二维码内容已命中违禁词，跳过OCR: {image_name}")
+                return qr_text
+        if ocr_text is None:
+            ocr_text = await _ocr_image(
+                image_name, image_data, decoded, ocr_result_cache_key
+            )
+        return join_image_texts(ocr_text, qr_text)
+
+
+async def _ocr_image(
+    image_name: str,
+    image_data: bytes,
+    decoded: Optional[DecodedImage],
+    cache_key: str,
+) -> str:
+    """识别图片中的文字，优先复用相似图片的结果
+
+    Args:
+        image_name: 图片文件名
+        image_data: 图像的二进制数据，交给OCR后端
+        decoded: 解码后的图片，用于相似图片查找和文字判断
+        cache_key: OCR结果的缓存键
+
+    Returns:
+        OCR结果，所有OCR后端都失败时返回空字符串
+
+    Raises:
+        OcrEngineLoadingError: 本地OCR模型正在加载，其他后端都不可用
+    """
+    # 换了文件名重发的相似图片直接复用之前的OCR结果
+    image_key, similar_text = await find_similar_image(decoded)
+    if similar_text is not None:
+        log.info(f"图片与近期图片相似，复用OCR结果: {image_name}")
+        save_cache(cache_key, similar_text, PrefixConstants.OCR_CACHE_TTL)
+        return similar_text
+
+    if not await may_contain_text(decoded):
+        # 不含文字的图片按空结果短暂缓存，不再进行OCR
+        # 没有实际识别过，不记入相似图片索引
+        log.info(f"图片不含文字，跳过OCR: {image_name}")
+        ocr_text = " "
+        save_cache(cache_key, ocr_text, PrefixConstants.OCR_SKIP_CACHE_TTL)
+        return ocr_text
+
+    try:
+        # 按后端链依次尝试，跳过不可用或熔断中的后端
+        ocr_text = await chain_ocr(image_data, cache_key)
+    except OcrEngineLoadingError:
+        # 交给调用方在模型加载完成后重新识别
+        raise
+    except OcrUnavailableError as e:
+        # 不缓存，之后再收到同一张图片时重新识别
+        log.error(f"OCR识别失败: {e}")
+        return ""
+    remember_image(image_key, ocr_text)
+    return ocr_text
+
+
+async def recognize_image_segments(
+    segments: list[MessageSegment], limit: asyncio.Semaphore
+) -> tuple[list[Optional[str]], list]:
+    """并发识别一条消息中的所有图片
+
+    开启 ocr_early_exit 时每张图片识别完立即检测，已确认命中后取消其余图片，
+    被取消的图片结果为空字符串
+
+    单张图片的命中结果直接返回，由调用方据此处理：
+    拼接后的文本受相邻内容影响，不一定能再次命中
+
+    Args:
+        segments: 图片消息段
+        limit: 限制同一条消息中同时处理的图片数
+
+    Returns:
+        (与 segments 一一对应的OCR结果, 单张图片命中的违禁词列表)
+
+    Raises:
+        OcrEngineLoadingError: 本地OCR模型正在加载，其他后端都不可用
+    """
+    tasks = [
+        asyncio.ensure_future(recognize_image_segment(segment, limit))
+        for segment in segments
+    ]
+    image_hits: list = []
+    try:
+        if env_config.ocr_early_exit:
+            for next_done in asyncio.as_completed(tasks):
+                ocr_text = await next_done
+                if ocr_text:
+                    image_hits = await check_text_async(ocr_text)
+                if image_hits:
+                    log.info("图片已命中违禁词，取消本条消息其余图片的识别")
+                    for task in tasks:
+                        task.cancel()
+                    break
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    ocr_results: list[Optional[str]] = []
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            # 提前结束时被取消的图片
+            ocr_results.append("")
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            ocr_results.append(result)
+    return ocr_results, image_hits
+
+
+def assemble_text(
+    message: Message, ocr_results: list[Optional[str]]
+) -> tuple[str, bool, bool]:
+    """
+    按消息段原有顺序拼接文本和图片识别结果
+
+    Args:
+        message: 原始消息
+        ocr_results: 与消息中的图片段一一对应的OCR结果
+
+    Returns:
+        拼接后的文本、是否含有图片识别结果、是否含有文本
+    """
+    full_text = ""
+    ocr_bool = False
+    text_bool = False
+    ocr_results_iter = iter(ocr_results)
+
+    for segment in message:
+        # 图片处理
+        if segment.type == "image":
+            ocr_result = next(ocr_results_iter)
+            if ocr_result:
+                # 如果识别结果不为空，添加到文本中
+                full_text += ocr_result
+                ocr_bool = True
+                log.debug(f"OCR识别结果: {ocr_result}")
+
+        # 文本处理
+        elif segment.type == "text":
+            raw_text = segment.data.get("text", "").strip()
+            # 如果文本不为空，添加到文本中
+            if raw_text:
+                full_text += raw_text
+                text_bool = True
+                log.debug(f"原始文本消息: {raw_text}")
+
+        else:
+            log.debug(f"未知消息类型: {segment}{segment.type}")
+    return full_text, ocr_bool, text_bool
+
+
+def defer_image_verdict(
+    bot: Bot, event: GroupMessageEvent, image_segments: list[MessageSegment]
+) -> None:
+    """
+    在后台识别图片，识别完成后重新判定整条消息
+
+    Args:
+        bot: Bot实例
+        event: 群消息事件
+        image_segments: 消息中的图片段
+    """
+    task = asyncio.create_task(judge_images_later(bot, event, image_segments))
+    deferred_tasks.add(task)
+    task.add_done_callback(deferred_tasks.discard)
+
+
+async def judge_images_later(
+    bot: Bot, event: GroupMessageEvent, image_segments: list[MessageSegment]
+) -> None:
+    """
+    识别延后判定的图片，命中违禁词时追溯执行禁言、撤回和通知
+
+    本地OCR模型正在加载时等待加载结束再识别；
+    消息发出超过 image_defer_max_age 秒后不再处理，避免超出撤回时限
+
+    Args:
+        bot: Bot实例
+        event: 群消息事件
+        image_segments: 消息中的图片段
+    """
+    max_age = env_config.image_defer_max_age
+    remaining = max_age - (time.time() - event.time) if max_age > 0 else None
+    limit = asyncio.Semaphore(max(1, env_config.image_concurrency))
+
+    async def recognize_when_ready() -> tuple[list[Optional[str]], list]:
+        while True:
+            await wait_ocr_engine()
+            try:
+                return await recognize_image_segments(image_segments, limit)
+            except OcrEngineLoadingError:
+                # 等待期间工作池被重建，重新等待加载
+                continue
+
+    try:
+        ocr_results, image_hits = await asyncio.wait_for(
+            recognize_when_ready(), remaining
+        )
+    except asyncio.TimeoutError:
+        log.warning(
+            f"消息 {event.message_id} 的图片未能在 {max_age} 秒内识别完成，放弃追溯"
+        )
+        return
+    except Exception as e:
+        log.error(f"后台识别图片失败: {e}")
+        return
+    if any(ocr_result is None for ocr_result in ocr_results):
+        return
+
+    full_text, ocr_bool, text_bool = assemble_text(event.message, ocr_results)
+    if not ocr_bool:
+        return
+    if not image_hits and not await check_text_async(full_text):
+        return
+    if 0 < max_age < time.time() - event.time:
+        log.warning(f"消息 {event.message_id} 已超过 {max_age} 秒，不再追溯处理")
+        return
+
+    log.info(f"图片识别后命中违禁词，追溯处理消息: {event.message_id}")
+    state: T_State = {
+        "raw_message": event.message,
+        "full_text": full_text,
+        "ocr_or_text": "both" if text_bool else "ocr",
+        "skipped_images": 0,
+        "deferred_images": len(image_segments),
+        "image_hits": image_hits,
+    }
+    try:
+        await judge_and_ban(event, state, bot)
+        await transmit_to_admin(event, state, bot)
+        await notify_member(event, state, bot)
+    except Exception as e:
+        log.error(f"追溯处理消息失败: {e}")
+
+
+async def text_segments_hit(message: Message) -> bool:
+    """
+    只检测消息中的文本段
+
+    拼接方式与 handle_message 相同，文本命中时整条消息的检测结果也会命中
+
+    Args:
+        message: 原始消息
+
+    Returns:
+        文本段是否包含违禁词
+    """
+    text = "".join(
+        segment.data.get("text", "").strip()
+        for segment in message
+        if segment.type == "text"
+    )
+    return bool(text) and bool(await check_text_async(text))
+
+
 @group_message_matcher.handle()
 async def handle_message(
     event: GroupMessageEvent,
     state: T_State,
-    # bot: Bot
+    bot: Bot,
 ):
     """处理群消息，提取文本和图片的文字
 
+    开启 text_first 时先检测文本段，文本已命中违禁词则跳过图片的下载和识别；
+    开启 image_defer 时文本未命中的消息立即按文本判定，图片转入后台识别；
+    本地OCR模型尚未加载完成且没有其他可用后端时，图片同样转入后台识别；
+    同一条消息中的多张图片并发下载和识别，结果按消息段原有顺序拼接；
+    开启 ocr_early_exit 时每张图片识别完立即检测，命中后取消其余图片的识别
+
     Args:
         state["full_text"]: 提取出的所有文本
         state["ocr_or_text"]: "ocr" or "text" or "both"
         state["raw_message"]: 原始消息
+        state["skipped_images"]: 因文本已命中而跳过识别的图片数
+        state["deferred_images"]: 转入后台识别的图片数
+        state["image_hits"]: 单张图片已命中的违禁词
     """
     # dict1 = await bot.get_group_info(group_id=event.group_id)
     # dict2 = await bot.get_group_member_info(group_id=event.group_id,user_id=event.user_id)
@@ -115,91 +553,46 @@ async def handle_message(
         getmsg = event.message
         # 将原始消息存储到状态中
         state["raw_message"] = getmsg
-        # 初始化变量
-        ocr_result = ""
-        raw_text = ""
-        full_text = ""
-        ocr_bool = False
-        text_bool = False
         # log.debug(f"{getmsg}")
 
-        for segment in getmsg:
-            # 图片处理
-            if segment.type == "image":
-                # 获取图片标识信息
-                image_name = segment.data.get("file", "")
-                image_url = segment.data.get("url", "")
-                if not image_name or not image_url:
-                    log.error(f"无法获取图片信息: {segment}")
-                    await group_message_matcher.finish()
-                    return
-
-                # 图片数据的缓存键
-                image_data_cache_key = f"{PrefixConstants.QQ_RAW_PICTURE}{image_name}"
-                # OCR结果的缓存键
-                ocr_result_cache_key = f"{PrefixConstants.OCR_RESULT_TEXT}{image_name}"
-
-                # 先检查缓存中是否有结果
-                if cache_exists(ocr_result_cache_key):
-                    cached_result = load_cache(ocr_result_cache_key)
-                    if cached_result:
-                        log.info(f"使用缓存的OCR结果: {image_name}")
-                        log.debug(f"缓存的OCR结果: {cached_result}")
-                        # 直接使用缓存的结果
-                        ocr_result = cached_result
-                    else:
-                        log.error("缓存存在但无法获取/不该出现")
-                        await group_message_matcher.finish()
-                        return
-
-                # 没有缓存，进行识别
-                else:
-                    if cache_exists(image_data_cache_key):
-                        image_data = load_cache(image_data_cache_key)
-                    else:
-                        async with httpx.AsyncClient(timeout=30.0) as client:
-                            response = await client.get(image_url)
-                            if response.status_code != 200:
-                                log.error(
-                                    f"获取图像失败，状态码: {response.status_code}"
-                                )
-                                await group_message_matcher.finish()
-                                return
-                            image_data = response.content
-                            save_cache(image_data_cache_key, image_data)
-
-                    try:
-                        # 尝试使用本地OCR
-                        try:
-                            ocr_text = local_ocr(image_data, ocr_result_cache_key)
-                        except Exception as e:
-                            log.warning(f"本地OCR失败: {e}，尝试在线OCR")
-                            # 如果本地OCR失败，尝试在线OCR
-                            ocr_text = online_ocr(image_data, ocr_result_cache_key)
-                    except Exception as e:
-                        log.error(f"OCR识别失败: {e}")
-                        await group_message_matcher.finish()
-                        return
-                    ocr_result = ocr_text
-                if ocr_result:
-                    # 如果识别结果不为空，添加到文本中
-                    full_text += ocr_result
-                    ocr_bool = True
-                    log.debug(f"OCR识别结果: {ocr_result}")
-
-            # 文本处理
-            elif segment.type == "text":
-                raw_text = segment.data.get("text", "").strip()
-                # 如果文本不为空，添加到文本中
-                if raw_text:
-                    full_text += raw_text
-                    text_bool = True
-                    log.debug(f"原始文本消息: {raw_text}")
-
-            else:
-                log.debug(f"未知消息类型: {segment}{segment.type}")
+        image_segments = [segment for segment in getmsg if segment.type == "image"]
+        state["skipped_images"] = 0
+        state["deferred_images"] = 0
+        state["image_hits"] = []
+        no_ocr: list[Optional[str]] = [""] * len(image_segments)
+        if (
+            (env_config.text_first or env_config.image_defer)
+            and image_segments
+            and await text_segments_hit(getmsg)
+        ):
+            # 文本已能确定结果，图片不再下载和识别
+            log.info(f"文本已命中违禁词，跳过 {len(image_segments)} 张图片的识别")
+            state["skipped_images"] = len(image_segments)
+            ocr_results = no_ocr
+        elif env_config.image_defer and image_segments:
+            # 先按文本判定，图片在后台识别，命中后追溯处理
+            defer_image_verdict(bot, event, image_segments)
+            state["deferred_images"] = len(image_segments)
+            ocr_results = no_ocr
+        else:
+            # 图片段先并发识别，之后与文本段按原顺序拼接
+            limit = asyncio.Semaphore(max(1, env_config.image_concurrency))
+            try:
+                ocr_results, state["image_hits"] = await recognize_image_segments(
+                    image_segments, limit
+                )
+            except OcrEngineLoadingError:
+                # 先按文本判定，模型加载完成后再识别图片并追溯处理
+                log.info("本地OCR模型正在加载，图片转入后台识别")
+                defer_image_verdict(bot, event, image_segments)
+                state["deferred_images"] = len(image_segments)
+                ocr_results = no_ocr
+        if any(ocr_result is None for ocr_result in ocr_results):
+            await group_message_matcher.finish()
+            return
 
         # 将提取的文本和图片识别结果存储到状态中
+        full_text, ocr_bool, text_bool = assemble_text(getmsg, ocr_results)
         state["full_text"] = full_text
         if ocr_bool and text_bool:
             state["ocr_or_text"] = "both"
@@ -207,7 +600,7 @@ async def handle_message(
             state["ocr_or_text"] = "ocr"
         elif text_bool:
             state["ocr_or_text"] = "text"
-        else:
+        elif not state["deferred_images"]:
             log.error("不存在文本或图像识别结果")
         return
     return
@@ -229,8 +622,11 @@ async def judge_and_ban(event: GroupMessageEvent, state: T_State, bot: Bot):
     state["revoke_success"] = False
     state["unban_reason"] = []
 
-    # 调用check_text函数检查文本
-    check_list = check_text(full_text)
+    # 在执行器中检查文本，避免阻塞事件循环
+    check_list = await check_text_async(full_text)
+    if not check_list and state.get("image_hits"):
+        # 单张图片已命中，拼接后的文本受相邻内容影响未能再次命中，以单张图片的结果为准
+        check_list = state["image_hits"]
     state["check_list"] = check_list
 
     # 存在违禁词
@@ -313,6 +709,12 @@ async def transmit_to_admin(event: GroupMessageEvent, state: T_State, bot: Bot):
                     f"识别整合文本:  {full_text}\n"
                     f"触发违禁词:  {state['check_list']}\n"
                 )
+                if state.get("skipped_images"):
+                    message += (
+                        f"未识别图片:  {state['skipped_images']} 张(文本已命中)\n"
+                    )
+                if state.get("deferred_images") and state["ocr_or_text"] != "text":
+                    message += "图片为延后识别，已追溯处理\n"
                 # 添加失败信息(如果有)
                 if not state["ban_success"] or not state["revoke_success"]:
                     if not state["ban_success"]:
@@ -332,12 +734,22 @@ async def transmit_to_admin(event: GroupMessageEvent, state: T_State, bot: Bot):
 
 @group_message_matcher.handle()
 async def notice_to_member(event: GroupMessageEvent, state: T_State, bot: Bot):
+    await notify_member(event, state, bot)
+    await group_message_matcher.finish()
+    return
+
+
+async def notify_member(event: GroupMessageEvent, state: T_State, bot: Bot):
+    """在群内提醒发送违禁词的用户
+
+    Args:
+        state["ban_judge"]: 是否禁言
+    """
     if state["ban_judge"]:
         message = "\n你发送的消息中包含管理员不允许发送的违禁词哦~"
         if state["ban_success"] and state["revoke_success"]:
             message += "\n你已被禁言并且撤回该消息\n申诉或对线请与接收通知的管理联系~"
         await bot.send(event=event, at_sender=True, message=message)
-    await group_message_matcher.finish()
     return
 
 
@@ -552,6 +964,3 @@ async def group_detect_public(
     await finish_matcher.send(success_msg)
     await finish_matcher.finish()
     return
-
-
-# TODO: 二维码检测
@@ -1,28 +1,65 @@
 import pathlib
 import re
+import threading
 import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from re import Pattern
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 
-from cleanse_speech import DLFA, SpamShelf
-from fuzzywuzzy import fuzz, process
+import jieba
+from cleanse_speech import SpamShelf
 from jieba import lcut_for_search
-from opencc import OpenCC
 
 from .config import config, save_config
-from .utils.constants import PrefixConstants
+from .detector import (
+    EXECUTION_MODES,
+    CheckExecutor,
+    DetectorSnapshot,
+    DomainBlocklist,
+    FuzzyIndex,
+    Hit,
+    MatchLayer,
+    Normalizer,
+    RegexEngine,
+    VerdictCache,
+    WordAutomaton,
+    fingerprint,
+    load_snapshot,
+    load_words,
+    save_snapshot,
+)
+from .utils.constants import PrefixConstants, StoragePathConstants
 from .utils.log import log
 
 pre_text_list = []
 
-_cached_ban_words = None
-_compiled_regex = {}  # 存储编译后的正则表达式
+_cached_library_words = None  # 预定义词库中的词，供模糊匹配使用
+_update_listeners: list[Callable[[], None]] = []  # 词库更新后调用的函数
+_matchers_lock = threading.Lock()  # 替换 matchers 时持有，避免覆盖新版本
+verdict_cache = VerdictCache(config.env.verdict_cache_size)  # 检测结果缓存
 
 config_pre_text_list = config.env.ban_pre_text
 config_ban_text_list = config.local.ban_text
 
+# 检测结构快照文件
+SNAPSHOT_FILE = StoragePathConstants.DETECTOR_SNAPSHOT_FILE
+# 快照在后台线程中写入，不阻塞事件循环；只有一个线程，多次更新按顺序写入
+_snapshot_writer = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="noadpls-snapshot"
+)
+
+# jieba 词典缓存放在插件缓存目录，避免系统临时目录被清理后重新解析词典
+StoragePathConstants.JIEBA_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+setattr(jieba.dt, "tmp_dir", str(StoragePathConstants.JIEBA_CACHE_PATH))
+
 # 定义正则表达式的前缀标识
 REGEX_PREFIX = PrefixConstants.BAN_PRE_TEXT_REGEX
+# 域名黑名单命中结果的前缀
+DOMAIN_PREFIX = PrefixConstants.BAN_DOMAIN
+
+# 域名黑名单，文本和二维码中的网址命中时视为违禁
+domain_blocklist = DomainBlocklist(config.local.ban_domain)
 
 SPAM_LIBRARIES = {
     "advertisement": SpamShelf.CN.ADVERTISEMENT,
@@ -57,20 +94,57 @@ regex_patterns = [
 ]
 
 
-dfa = DLFA(words_resource=[*pre_text_list, normal_words])
+# 预处理步骤:
+# 1. Unicode规范化 (NFKC模式将兼容字符转为标准形式)
+# 2. 移除所有非中文、非英文、非数字的字符，保留中文(含日韩)、英文和数字
+# 3. 处理常见替代字符
+# 4. 繁体转简体
+PREPROCESS_STRIP_PATTERN = r"[^\u4e00-\u9fff\u3040-\u30ff\u3130-\u318fa-zA-Z0-9]"
+REPLACE_PAIRS = {
+    "0": "o",
+    "○": "o",
+    "〇": "o",
+    "1": "l",
+    "壹": "一",
+    "2": "二",
+    "贰": "二",
+    "5": "s",
+    "五": "5",
+    "6": "b",
+    "六": "6",
+    "8": "B",
+    "八": "8",
+    "9": "g",
+    "九": "9",
+    "c": "口",
+    "d": "口",
+    "@": "a",
+}
+
+normalizer = Normalizer(
+    PREPROCESS_STRIP_PATTERN,
+    REPLACE_PAIRS,
+    cache_size=config.env.normalize_cache_size,
+)
 
 
-def _compile_regex_patterns(patterns: list[str]) -> dict[str, Pattern]:
+def _compile_regex_patterns(
+    patterns: list[str], previous: Optional[dict[str, Pattern]] = None
+) -> dict[str, Pattern]:
     """编译正则表达式模式
 
     Args:
         patterns: 正则表达式字符串列表
+        previous: 之前编译的结果，其中已有的模式直接复用
 
     Returns:
         编译后的正则表达式字典 {模式字符串: 编译后的模式}
     """
     compiled = {}
     for pattern in patterns:
+        if previous and pattern in previous:
+            compiled[pattern] = previous[pattern]
+            continue
         try:
             compiled[pattern] = re.compile(pattern, re.IGNORECASE)
             log.debug(f"成功编译正则表达式: {pattern}")
@@ -79,14 +153,26 @@ def _compile_regex_patterns(patterns: list[str]) -> dict[str, Pattern]:
     return compiled
 
 
-_compiled_regex = _compile_regex_patterns(regex_patterns)
+class Matchers(NamedTuple):
+    """同一版本词库对应的全部匹配结构
+
+    更新词库时生成新的实例整体替换，检测开始时取一次引用，
+    保证同一次检测始终使用同一版本，不会看到构建到一半的结构
+    """
+
+    automaton: WordAutomaton
+    """精确匹配自动机"""
+    regex_engine: RegexEngine
+    """正则规则匹配器"""
+    fuzzy_index: Optional[FuzzyIndex] = None
+    """模糊匹配候选索引，首次模糊匹配时构建"""
 
 
 def _load_ban_words_from_resources():
-    """从资源文件加载所有违禁词，仅执行一次"""
-    global _cached_ban_words
-    if _cached_ban_words is not None:
-        return _cached_ban_words
+    """从资源文件加载所有违禁词，预定义词库仅读取一次"""
+    global _cached_library_words
+    if _cached_library_words is not None:
+        return [*_cached_library_words, *normal_words]
 
     # 获取所有违禁词
     all_ban_words = []
@@ -126,68 +212,347 @@ def _load_ban_words_from_resources():
             log.error(f"预定义词库 {resource} 不存在或不可读")
             continue
 
+    _cached_library_words = all_ban_words
+    log.info(f"成功预加载 {len(all_ban_words)} 个预定义违禁词")
+
     # 添加自定义违禁词（仅普通文本，不包含正则表达式）
-    all_ban_words.extend(normal_words)
+    return [*all_ban_words, *normal_words]
+
+
+def _snapshot_fingerprint() -> str:
+    """当前预定义词库和自定义普通违禁词的指纹"""
+    libraries = [r for r in pre_text_list if isinstance(r, pathlib.Path)]
+    return fingerprint(libraries, normal_words)
+
+
+def _write_snapshot(snapshot: DetectorSnapshot) -> None:
+    """在快照写入线程中序列化并保存快照
+
+    Args:
+        snapshot: 要保存的快照
+    """
+    try:
+        save_snapshot(SNAPSHOT_FILE, snapshot)
+        log.debug(f"检测结构快照已保存: {SNAPSHOT_FILE}")
+    except Exception as e:
+        log.warning(f"保存检测结构快照失败: {e}")
+
+
+def _save_snapshot(current: Matchers) -> None:
+    """在后台将构建好的匹配结构写入快照，模糊匹配索引尚未构建时跳过
+
+    指纹在调用时计算，与传入的匹配结构对应
+
+    Args:
+        current: 要保存的匹配结构
+    """
+    if not config.env.detector_snapshot:
+        return
+    if current.fuzzy_index is None or _cached_library_words is None:
+        return
+    snapshot = DetectorSnapshot(
+        fingerprint=_snapshot_fingerprint(),
+        automaton=current.automaton,
+        fuzzy_index=current.fuzzy_index,
+        library_words=_cached_library_words,
+    )
+    _snapshot_writer.submit(_write_snapshot, snapshot)
+
+
+def _build_regex_engine(previous: Optional[RegexEngine] = None) -> RegexEngine:
+    """编译当前的正则规则并构建匹配器
+
+    Args:
+        previous: 旧版本的匹配器，其中已编译的模式直接复用
+
+    Returns:
+        正则规则匹配器
+    """
+    return RegexEngine(
+        _compile_regex_patterns(
+            regex_patterns, previous.compiled if previous is not None else None
+        )
+    )
+
 
-    _cached_ban_words = all_ban_words
-    log.info(f"成功预加载 {len(all_ban_words)} 个违禁词")
-    return all_ban_words
+def _load_or_build_matchers(
+    previous_regex: Optional[RegexEngine] = None,
+) -> Matchers:
+    """从快照恢复匹配结构，快照不存在或词库已变化时重新构建并保存
+
+    Args:
+        previous_regex: 旧版本的正则匹配器，其中已编译的模式直接复用
+
+    Returns:
+        匹配结构
+    """
+    global _cached_library_words
+    regex_engine = _build_regex_engine(previous_regex)
+    words_resource = [*pre_text_list, normal_words]
+    if not config.env.detector_snapshot:
+        return Matchers(WordAutomaton(words_resource), regex_engine)
+
+    snapshot = load_snapshot(SNAPSHOT_FILE, _snapshot_fingerprint())
+    if snapshot is not None:
+        _cached_library_words = snapshot.library_words
+        log.info(f"已从快照加载检测结构，共 {len(snapshot.automaton)} 个违禁词")
+        return Matchers(snapshot.automaton, regex_engine, snapshot.fuzzy_index)
+
+    # 快照一并保存模糊匹配索引，因此在这里直接构建
+    _cached_library_words = None
+    built = Matchers(
+        WordAutomaton(words_resource),
+        regex_engine,
+        FuzzyIndex(_load_ban_words_from_resources()),
+    )
+    _save_snapshot(built)
+    return built
+
+
+matchers = _load_or_build_matchers()
+
+
+def detect(text: str, all_layers: bool = False) -> list[Hit]:
+    """多层次检测文本，返回带层级的命中结果
+
+    原始文本与预处理后文本在同一缓冲区上由自动机一次扫描完成
+
+    Args:
+        text: 需要检查的文本
+        all_layers: 是否返回所有层级的命中，为False时只返回第一个有命中的层级
+
+    Returns:
+        命中结果列表
+    """
+    return detect_many([text], all_layers)[0]
+
+
+def detect_many(texts: list[str], all_layers: bool = False) -> list[list[Hit]]:
+    """批量多层次检测，结果与逐条调用 detect 一致
+
+    - 所有文本的原始/预处理结果拼在同一缓冲区上由自动机一次扫描
+    - 预处理结果相同的文本只分词、模糊匹配一次
+    - 不同文本中重复出现的分词只打分一次
+
+    Args:
+        texts: 需要检查的文本列表
+        all_layers: 是否返回所有层级的命中，为False时只返回第一个有命中的层级
+
+    Returns:
+        与 texts 一一对应的命中结果列表
+    """
+    current = matchers
+    results: list[list[Hit]] = [[] for _ in texts]
+
+    # 第一层 + 第二层：原始文本与预处理后文本的精确匹配
+    processed_texts = [preprocess_text(text) for text in texts]
+    segments: list[str] = []
+    layers: list[tuple[int, MatchLayer]] = []
+    for index, (text, processed_text) in enumerate(zip(texts, processed_texts)):
+        segments.append(text)
+        layers.append((index, MatchLayer.RAW))
+        if processed_text != text:
+            segments.append(processed_text)
+            layers.append((index, MatchLayer.NORMALIZED))
+    finished = [False] * len(texts)
+    exact_results = current.automaton.extract_many(segments)
+    for (index, layer), words in zip(layers, exact_results):
+        if words and not finished[index]:
+            results[index].extend(Hit(layer, word) for word in words)
+            finished[index] = not all_layers
+
+    # 第三层：模糊匹配检测
+    fuzzy_results: dict[str, list] = {}
+    scores: dict[str, Optional[tuple[str, int]]] = {}
+    for index, processed_text in enumerate(processed_texts):
+        if finished[index]:
+            continue
+        fuzzy_matches = fuzzy_results.get(processed_text)
+        if fuzzy_matches is None:
+            fuzzy_matches = fuzzy_match_check(
+                processed_text, current=current, memo=scores
+            )
+            fuzzy_results[processed_text] = fuzzy_matches
+        if fuzzy_matches:
+            results[index].extend(Hit(MatchLayer.FUZZY, word) for word in fuzzy_matches)
+            finished[index] = not all_layers
+
+    # 第四层：正则表达式检测
+    for index, text in enumerate(texts):
+        if finished[index]:
+            continue
+        regex_matches = regex_match_check(text, current=current)
+        if regex_matches:
+            results[index].extend(Hit(MatchLayer.REGEX, word) for word in regex_matches)
+            finished[index] = not all_layers
+
+    # 第五层：域名黑名单检测
+    for index, text in enumerate(texts):
+        if finished[index]:
+            continue
+        results[index].extend(
+            Hit(MatchLayer.DOMAIN, f"{DOMAIN_PREFIX}{domain}")
+            for domain in domain_blocklist.scan(text)
+        )
+
+    return results
+
+
+def _get_fuzzy_index(current: Matchers) -> FuzzyIndex:
+    """获取模糊匹配索引，首次调用时构建
+
+    Args:
+        current: 本次检测使用的匹配结构
+
+    Returns:
+        模糊匹配索引
+    """
+    global matchers
+    if current.fuzzy_index is not None:
+        return current.fuzzy_index
+    fuzzy_index = FuzzyIndex(_load_ban_words_from_resources())
+    log.debug(f"模糊匹配索引构建完成，共 {len(fuzzy_index)} 个词")
+    # 构建期间词库未被更新时才写回
+    with _matchers_lock:
+        if matchers is current:
+            matchers = current._replace(fuzzy_index=fuzzy_index)
+    return fuzzy_index
 
 
 def check_text(text: str) -> list:
     """多层次检查文本是否包含违禁词
 
+    相同文本的结果会被缓存，词库更新后自动失效
+
     Args:
         text: 需要检查的文本
 
     Returns:
         违禁词列表
     """
-    # 第一层：原始DFA检测
-    result = dfa.extract_illegal_words(text)
-    if result:
-        return result
-
-    # 第二层：基础预处理后检测
-    processed_text = preprocess_text(text)
-    if processed_text != text:
-        result = dfa.extract_illegal_words(processed_text)
-        if result:
-            return result
+    version = verdict_cache.version
+    cached = verdict_cache.get(text)
+    if cached is not None:
+        log.debug(f"使用缓存的检测结果: {cached}")
+        return cached
+
+    result = [hit.word for hit in detect(text)]
+    verdict_cache.put(text, result, version)
+    return result
 
-    # 第三层：模糊匹配检测
-    fuzzy_matches = fuzzy_match_check(processed_text)
-    if fuzzy_matches:
-        return fuzzy_matches
 
-    # 第四层：正则表达式检测
-    regex_matches = regex_match_check(text)
-    if regex_matches:
-        return regex_matches
+def check_texts(texts: list[str]) -> list[list]:
+    """批量检查文本是否包含违禁词，结果与逐条调用 check_text 一致
+
+    缓存命中的文本直接返回，重复文本只检测一次，其余文本一起交给 detect_many
+
+    Args:
+        texts: 需要检查的文本列表
+
+    Returns:
+        与 texts 一一对应的违禁词列表
+    """
+    version = verdict_cache.version
+    results: list[list] = [[] for _ in texts]
+    pending: dict[str, list[int]] = {}
+    for index, text in enumerate(texts):
+        if text in pending:
+            pending[text].append(index)
+            continue
+        cached = verdict_cache.get(text)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending[text] = [index]
+
+    if pending:
+        unique_texts = list(pending)
+        for text, hits in zip(unique_texts, detect_many(unique_texts)):
+            words = [hit.word for hit in hits]
+            verdict_cache.put(text, words, version)
+            for index in pending[text]:
+                results[index] = list(words)
+    return results
+
+
+def _detect_words(text: str) -> list:
+    """执行检测并只返回违禁词，供执行器在线程/子进程中调用"""
+    return [hit.word for hit in detect(text)]
+
+
+def warm_up() -> None:
+    """加载 jieba 词典，避免第一条消息承担加载耗时"""
+    jieba.initialize()
+
+
+def _prepare_fork() -> None:
+    """fork 子进程前预先构建模糊匹配索引并加载分词词典，子进程直接继承"""
+    _get_fuzzy_index(matchers)
+    jieba.initialize()
+
+
+check_mode = config.env.check_mode.lower()
+if check_mode not in EXECUTION_MODES:
+    log.warning(f"未知的检测执行模式: {check_mode}，使用 thread")
+    check_mode = "thread"
+check_executor = CheckExecutor(
+    _detect_words,
+    mode=check_mode,
+    max_workers=config.env.check_workers,
+    queue_size=config.env.check_queue_size,
+    prepare=_prepare_fork,
+)
+if check_executor.mode != check_mode:
+    log.warning(f"当前平台不支持 {check_mode} 模式，使用 {check_executor.mode}")
+elif check_executor.mode == "process":
+    # 此时OCR线程池、快照写入线程等可能已经存在，fork 出的子进程只继承调用线程，
+    # 其他线程持有的锁会永久保持锁定；且每次词库更新都会重新 fork
+    log.warning(
+        "检测使用 process 模式，fork 带线程的进程可能导致子进程卡死，仅在确认可用时使用"
+    )
 
-    return []
 
+async def check_text_async(text: str) -> list:
+    """在执行器中检查文本是否包含违禁词，不阻塞事件循环
 
-def regex_match_check(text: str) -> list:
+    缓存命中时直接返回，否则按配置的执行模式提交检测任务，
+    排队任务过多时等待空位
+
+    Args:
+        text: 需要检查的文本
+
+    Returns:
+        违禁词列表
+    """
+    version = verdict_cache.version
+    cached = verdict_cache.get(text)
+    if cached is not None:
+        log.debug(f"使用缓存的检测结果: {cached}")
+        return cached
+
+    result = await check_executor.run(text)
+    verdict_cache.put(text, result, version)
+    return result
+
+
+def regex_match_check(text: str, current: Optional[Matchers] = None) -> list:
     """使用正则表达式检查文本
 
     Args:
         text: 要检查的文本
+        current: 使用的匹配结构，默认为当前版本
 
     Returns:
         匹配到的正则表达式列表
     """
-    matches = []
-    # log.debug(f"检查文本: {text}")
-
-    # 对每个正则表达式进行匹配
-    for pattern, compiled_pattern in _compiled_regex.items():
-        log.debug(f"检查正则表达式: {pattern}")
-        if compiled_pattern.search(text):
-            matches.append(f"{REGEX_PREFIX}{pattern}: {compiled_pattern.findall(text)}")
-            log.debug(
-                f"正则表达式匹配成功: {pattern}: {compiled_pattern.findall(text)}"
-            )
+    # 合并匹配器一次扫描筛出可能命中的规则，每条命中规则只 findall 一次
+    regex_engine = (current or matchers).regex_engine
+    matches = [
+        f"{REGEX_PREFIX}{pattern}: {found}"
+        for pattern, found in regex_engine.scan(text)
+    ]
+    if matches:
+        log.debug(f"正则表达式匹配成功: {matches}")
 
     return matches
 
@@ -201,58 +566,32 @@ def preprocess_text(text: str) -> str:
     Returns:
         处理后的文本
     """
-    # 步骤1: Unicode规范化 (NFKC模式将兼容字符转为标准形式)
-    result = unicodedata.normalize("NFKC", text)
-
-    # 步骤2: 移除所有非中文、非英文、非数字的字符
-    # 保留中文(含日韩)、英文和数字，移除其他所有字符
-    result = re.sub(r"[^\u4e00-\u9fff\u3040-\u30ff\u3130-\u318fa-zA-Z0-9]", "", result)
-
-    # 步骤3: 处理常见替代字符
-    replace_pairs = {
-        "0": "o",
-        "○": "o",
-        "〇": "o",
-        "1": "l",
-        "壹": "一",
-        "2": "二",
-        "贰": "二",
-        "5": "s",
-        "五": "5",
-        "6": "b",
-        "六": "6",
-        "8": "B",
-        "八": "8",
-        "9": "g",
-        "九": "9",
-        "c": "口",
-        "d": "口",
-        "@": "a",
-    }
-
-    for old, new in replace_pairs.items():
-        result = result.replace(old, new)
-
-    result = OpenCC("t2s").convert(result)  # 繁体转简体
-
+    result = normalizer.normalize(text)
     log.debug(f"文本预处理: '{text}' -> '{result}'")
     return result
 
 
-def fuzzy_match_check(text: str, min_score: int = 85) -> list:
+def fuzzy_match_check(
+    text: str,
+    min_score: int = 85,
+    current: Optional[Matchers] = None,
+    memo: Optional[dict[str, Optional[tuple[str, int]]]] = None,
+) -> list:
     """使用jieba分词和模糊匹配进行检测
 
     Args:
         text: 要检查的文本
         min_score: 最低匹配分数阈值(0-100)，越高要求越严格
+        current: 使用的匹配结构，默认为当前版本
+        memo: 分词 -> 匹配结果的缓存，批量检测时在多次调用间共享(需使用相同阈值)
 
     Returns:
         匹配到的违禁词列表
     """
-    all_ban_words = _load_ban_words_from_resources()
+    fuzzy_index = _get_fuzzy_index(current or matchers)
 
     # 如果违禁词库为空，直接返回
-    if not all_ban_words:
+    if not len(fuzzy_index):
         return []
 
     # 对文本进行分词
@@ -267,11 +606,14 @@ def fuzzy_match_check(text: str, min_score: int = 85) -> list:
     # 对每个分词结果进行模糊匹配
     for word in check_words:
         normalized_word = unicodedata.normalize("NFKC", word).lower()
-        # 使用process.extractOne获取最佳匹配结果
-        match_result = process.extractOne(
-            normalized_word, all_ban_words, scorer=fuzz.ratio
-        )
-        if match_result and match_result[1] >= min_score:
+        # 只对索引给出的候选词精确打分，结果与process.extractOne一致
+        if memo is not None and normalized_word in memo:
+            match_result = memo[normalized_word]
+        else:
+            match_result = fuzzy_index.extract_one(normalized_word, min_score)
+            if memo is not None:
+                memo[normalized_word] = match_result
+        if match_result:
             ban_word = match_result[0]  # 匹配到的违禁词
             score = match_result[1]  # 匹配分数
 
@@ -282,6 +624,15 @@ def fuzzy_match_check(text: str, min_score: int = 85) -> list:
     return matches
 
 
+def add_update_listener(listener: Callable[[], None]) -> None:
+    """注册词库更新后调用的函数，用于刷新持有旧版本匹配结构的其他进程池
+
+    Args:
+        listener: 无参数的函数，在事件循环所在线程中同步调用
+    """
+    _update_listeners.append(listener)
+
+
 def update_words(
     new_words: Optional[list[str]] = None,
     add_words: Optional[list[str]] = None,
@@ -300,17 +651,16 @@ def update_words(
         是否成功更新
     """
     global \
-        dfa, \
         config_ban_text_list, \
         pre_text_list, \
-        _cached_ban_words, \
-        _compiled_regex, \
+        _cached_library_words, \
+        matchers, \
         normal_words, \
         regex_patterns
 
-    _cached_ban_words = None
-
     try:
+        old_ban_text = list(config.local.ban_text)
+
         # 更新自定义违禁词列表
         if new_words:
             # 完全替换现有自定义违禁词
@@ -360,6 +710,7 @@ def update_words(
                 log.info("使用默认词库: advertisement")
 
         # 分离并更新普通文本和正则表达式
+        old_normal_words = normal_words
         normal_words = [
             w for w in config_ban_text_list if not w.startswith(REGEX_PREFIX)
         ]
@@ -369,19 +720,50 @@ def update_words(
             if w.startswith(REGEX_PREFIX)
         ]
 
-        # 重新编译正则表达式
-        _compiled_regex = _compile_regex_patterns(regex_patterns)
-
-        # 重建DFA检测器 (仅使用普通文本)
-        dfa = DLFA(
-            words_resource=[
-                *pre_text_list,  # 预定义词库
-                normal_words,  # 自定义普通违禁词
-            ]
-        )
+        # 正则规则只编译新增的
+        current = matchers
+        if reload_library:
+            # 预定义词库可能变化，整体重建(词库未变时直接使用快照)
+            _cached_library_words = None
+            new_matchers = _load_or_build_matchers(current.regex_engine)
+        else:
+            # 只把自定义词的差异增量应用到现有结构上
+            old_counts = Counter(old_normal_words)
+            new_counts = Counter(normal_words)
+            added_words = list((new_counts - old_counts).elements())
+            removed_words = list((old_counts - new_counts).elements())
+            fuzzy_index = current.fuzzy_index
+            if fuzzy_index is not None:
+                fuzzy_index = fuzzy_index.with_changes(added_words, removed_words)
+            new_matchers = Matchers(
+                automaton=current.automaton.with_changes(
+                    load_words(added_words), load_words(removed_words)
+                ),
+                regex_engine=_build_regex_engine(current.regex_engine),
+                fuzzy_index=fuzzy_index,
+            )
+            log.debug(
+                f"增量更新违禁词: 新增 {len(added_words)} 个，"
+                f"删除 {len(removed_words)} 个"
+            )
 
-        # 保存配置到文件
-        save_config()
+        # 整体替换，检测中的消息继续使用旧版本
+        with _matchers_lock:
+            matchers = new_matchers
+        # 进程池中的子进程持有旧版本，需重新 fork
+        check_executor.restart()
+        for listener in _update_listeners:
+            listener()
+        # 下次启动直接使用更新后的结构
+        if not reload_library:
+            _save_snapshot(new_matchers)
+
+        # 使之前缓存的检测结果失效
+        verdict_cache.bump_version()
+
+        # 自定义违禁词有变化时才保存配置到文件
+        if config.local.ban_text != old_ban_text:
+            save_config()
 
         log.info("违禁词更新完成")
         return True
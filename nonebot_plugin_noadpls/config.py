@@ -12,6 +12,7 @@ class LocalConfigModel(BaseModel):
     # enable_feature: bool = True
     ban_time: list[int] = [60, 300, 1800, 3600, 86400]
     ban_text: list[str] = []
+    ban_domain: list[str] = []
     # ban_text_path: List[str] = []
 
 
@@ -23,6 +24,41 @@ class EnvConfigModel(BaseModel):
     # block: bool = False
 
     ban_pre_text: list[str] = ["advertisement"]
+    normalize_cache_size: int = 1024
+    verdict_cache_size: int = 4096
+    detector_snapshot: bool = True
+    check_mode: str = "thread"
+    check_workers: int = 2
+    check_queue_size: int = 64
+    text_first: bool = True
+    image_concurrency: int = 4
+    image_max_bytes: int = 10 * 1024 * 1024
+    image_max_connections: int = 20
+    image_defer: bool = False
+    image_defer_max_age: float = 120.0
+    qr_detect: bool = True
+    ocr_early_exit: bool = True
+    ocr_mode: str = "thread"
+    ocr_workers: int = 1
+    ocr_queue_size: int = 16
+    ocr_timeout: float = 30.0
+    ocr_warm_up_timeout: float = 600.0
+    ocr_warm_up_retry: float = 60.0
+    ocr_max_side: int = 1600
+    ocr_max_tiles: int = 8
+    ocr_max_pixels: int = 50_000_000
+    ocr_grayscale: bool = True
+    ocr_text_gate: float = 0.01
+    ocr_phash_size: int = 0
+    ocr_phash_distance: int = 5
+    ocr_backends: list[str] = ["local", "online"]
+    ocr_breaker_failures: int = 3
+    ocr_breaker_reset: float = 60.0
+    ocr_slow_threshold: float = 0.0
+    ocr_api_url: str = "https://www.paddlepaddle.org.cn/paddlehub-api/image_classification/chinese_ocr_db_crnn_mobile"
+    ocr_api_timeout: float = 30.0
+    ocr_api_retries: int = 2
+    ocr_api_max_connections: int = 10
 
 
 class PrefixModel(BaseModel):
@@ -0,0 +1,33 @@
+from .automaton import WordAutomaton as WordAutomaton
+from .automaton import load_words as load_words
+from .domain_blocklist import DomainBlocklist as DomainBlocklist
+from .executor import EXECUTION_MODES as EXECUTION_MODES
+from .executor import CheckExecutor as CheckExecutor
+from .fuzzy_index import FuzzyIndex as FuzzyIndex
+from .hit import Hit as Hit
+from .hit import MatchLayer as MatchLayer
+from .normalizer import Normalizer as Normalizer
+from .regex_engine import RegexEngine as RegexEngine
+from .snapshot import DetectorSnapshot as DetectorSnapshot
+from .snapshot import fingerprint as fingerprint
+from .snapshot import load_snapshot as load_snapshot
+from .snapshot import save_snapshot as save_snapshot
+from .verdict_cache import VerdictCache as VerdictCache
+
+__all__ = [
+    "EXECUTION_MODES",
+    "CheckExecutor",
+    "DetectorSnapshot",
+    "DomainBlocklist",
+    "FuzzyIndex",
+    "Hit",
+    "MatchLayer",
+    "Normalizer",
+    "RegexEngine",
+    "VerdictCache",
+    "WordAutomaton",
+    "fingerprint",
+    "load_snapshot",
+    "load_words",
+    "save_snapshot",
+]
@@ -0,0 +1,419 @@
+import base64
+import io
+import pathlib
+import re
+from typing import Optional, Union
+
+WordsResource = Union[list[str], io.BytesIO, pathlib.Path]
+
+
+def load_words(words_resource: WordsResource) -> list[str]:
+    """按 cleanse_speech.DLFA 的规则读取词库
+
+    词库每行一个词，能按base64解码的按解码结果处理，否则保留原文
+
+    Args:
+        words_resource: 词列表、BytesIO 或词库文件路径
+
+    Returns:
+        词列表(未去重)
+    """
+    if isinstance(words_resource, io.BytesIO):
+        lines = words_resource.getvalue().decode("utf-8").splitlines()
+    elif isinstance(words_resource, pathlib.Path):
+        if not words_resource.exists():
+            raise FileNotFoundError(f"词库文件 {words_resource} 不存在")
+        with open(words_resource) as f:
+            lines = f.readlines()
+    else:
+        lines = words_resource
+
+    words = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            word = base64.b64decode(line).decode("utf-8").strip()
+        except Exception:
+            word = line
+        words.append(word)
+    return words
+
+
+def _char_class(chars: set[str]) -> str:
+    """将字符集合转换为正则字符类的内容"""
+    return "".join(re.escape(char) for char in sorted(chars))
+
+
+class WordAutomaton:
+    """Aho-Corasick 多模式匹配自动机
+
+    匹配结果与 cleanse_speech.DLFA.extract_illegal_words 完全一致:
+    从左到右取最靠前的起点、该起点上最短的词，命中后从词尾继续；
+    若某个起点一直匹配到文本末尾仍未成词，则停止后续匹配
+
+    构建完成后不再原地修改，with_changes 以写时复制的方式生成新自动机，
+    正在扫描的旧自动机不受影响
+    """
+
+    def __init__(self, words_resource: list[WordsResource]) -> None:
+        """
+        构建自动机
+
+        Args:
+            words_resource: 词库列表，元素为词列表、BytesIO 或词库文件路径
+        """
+        # 词 -> 来源次数，同一个词可能同时来自多个词库
+        self._counts: dict[str, int] = {}
+        for resource in words_resource:
+            for word in load_words(resource):
+                if word:
+                    self._counts[word] = self._counts.get(word, 0) + 1
+        self._build()
+
+    @property
+    def words(self) -> list[str]:
+        """去重后的词列表，按首次出现的顺序排列"""
+        return list(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def _build(self) -> None:
+        """构建 trie、失败指针以及各状态的最长输出长度"""
+        goto: list[dict[str, int]] = [{}]
+        depth = [0]
+        is_end = [False]
+        parent = [-1]
+        labels = [""]
+        for word in self._counts:
+            state = 0
+            for char in word:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    depth.append(depth[state] + 1)
+                    is_end.append(False)
+                    parent.append(state)
+                    labels.append(labels[state] + char)
+                state = nxt
+            is_end[state] = True
+
+        # 广度优先计算失败指针，match_len 为以该状态结尾的最长词长度
+        fail = [0] * len(goto)
+        match_len = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            match_len[state] = depth[state] if is_end[state] else 0
+        for state in queue:
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                match_len[nxt] = depth[nxt] if is_end[nxt] else match_len[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._depth = depth
+        self._is_end = is_end
+        self._parent = parent
+        self._labels = labels
+        self._match_len = match_len
+        # 失败指针的反向表，只在增量更新时才需要
+        self._fail_children: Optional[list[set[int]]] = None
+        self._build_candidates()
+
+    def _build_candidates(self) -> None:
+        """构建候选起点过滤正则"""
+        goto = self._goto
+        is_end = self._is_end
+        # 候选起点过滤: 单字违禁词，或首字与次字都可能在 trie 上走通的位置
+        # 空闲状态下用它在 C 层直接跳到下一个可能成词的位置
+        singles = set()
+        firsts = set()
+        seconds = set()
+        for char, state in goto[0].items():
+            if is_end[state]:
+                singles.add(char)
+            elif goto[state]:
+                firsts.add(char)
+                seconds.update(goto[state])
+        branches = []
+        if singles:
+            branches.append(f"[{_char_class(singles)}]")
+        if firsts:
+            branches.append(f"[{_char_class(firsts)}][{_char_class(seconds)}]")
+        self._root_pattern = re.compile("|".join(branches)) if branches else None
+
+    def _scan(self, text: str, lo: int, hi: int, out: list[str]) -> None:
+        """在 text[lo:hi] 上提取违禁词并追加到 out"""
+        goto = self._goto
+        fail = self._fail
+        depth = self._depth
+        match_len = self._match_len
+        root_search = self._root_pattern.search  # type: ignore[union-attr]
+
+        pos = lo
+        while pos < hi:
+            found = root_search(text, pos, hi)
+            if found is None:
+                return
+            i = found.start()
+            state = 0
+            best_start = -1
+            best_end = -1
+            while i < hi:
+                char = text[i]
+                nxt = goto[state].get(char)
+                while nxt is None and state:
+                    state = fail[state]
+                    nxt = goto[state].get(char)
+                state = nxt or 0
+                i += 1
+                length = match_len[state]
+                if length and (best_start < 0 or i - length < best_start):
+                    best_start = i - length
+                    best_end = i
+                if best_start >= 0:
+                    # 不存在比当前命中更靠前且仍可能成词的起点
+                    if i - depth[state] >= best_start:
+                        break
+                elif not state:
+                    # 空闲状态，跳到下一个候选字符
+                    found = root_search(text, i, hi)
+                    if found is None:
+                        return
+                    i = found.start()
+            else:
+                # 到达文本末尾: 更靠前的起点未成词即停止(与DLFA一致)
+                if depth[state] and (best_start < 0 or hi - depth[state] < best_start):
+                    return
+            if best_start < 0:
+                return
+            out.append(text[best_start:best_end])
+            pos = best_end
+
+    def extract(self, text: str) -> list[str]:
+        """
+        提取文本中的违禁词
+
+        Args:
+            text: 需要检查的文本
+
+        Returns:
+            命中的违禁词列表
+        """
+        out: list[str] = []
+        if self._root_pattern is not None and text:
+            self._scan(text, 0, len(text), out)
+        return out
+
+    def extract_many(self, texts: list[str]) -> list[list[str]]:
+        """
+        在同一缓冲区上一次扫描多段文本，各段互不跨越
+
+        Args:
+            texts: 文本列表
+
+        Returns:
+            与 texts 一一对应的命中列表
+        """
+        results: list[list[str]] = [[] for _ in texts]
+        if self._root_pattern is None:
+            return results
+        buffer = "".join(texts)
+        lo = 0
+        for index, text in enumerate(texts):
+            hi = lo + len(text)
+            if hi > lo:
+                self._scan(buffer, lo, hi, results[index])
+            lo = hi
+        return results
+
+    def with_changes(
+        self,
+        add_words: Optional[list[str]] = None,
+        remove_words: Optional[list[str]] = None,
+    ) -> "WordAutomaton":
+        """
+        增量增删词，返回新的自动机，自身保持不变
+
+        只复制被修改的节点，失败指针和输出长度只在受影响的子树上重新计算，
+        结果与用同一组词重新构建的自动机一致
+
+        Args:
+            add_words: 需要添加的词
+            remove_words: 需要删除的词，同一个词来自多个来源时只减少一次计数
+
+        Returns:
+            更新后的自动机
+        """
+        new = object.__new__(WordAutomaton)
+        new._counts = dict(self._counts)
+        new._goto = list(self._goto)
+        new._fail = list(self._fail)
+        new._depth = list(self._depth)
+        new._is_end = list(self._is_end)
+        new._parent = list(self._parent)
+        new._labels = list(self._labels)
+        new._match_len = list(self._match_len)
+        new._root_pattern = self._root_pattern
+        if self._fail_children is None:
+            new._fail_children = [set() for _ in self._fail]
+            for state in range(1, len(self._fail)):
+                if self._parent[state] >= 0:
+                    new._fail_children[self._fail[state]].add(state)
+        else:
+            new._fail_children = list(self._fail_children)
+        new._apply_changes(add_words or [], remove_words or [])
+        return new
+
+    def _apply_changes(self, add_words: list[str], remove_words: list[str]) -> None:
+        """在刚复制出的自动机上增删词，共享的 dict/set 修改前先复制"""
+        goto = self._goto
+        fail = self._fail
+        depth = self._depth
+        is_end = self._is_end
+        parent = self._parent
+        labels = self._labels
+        children = self._fail_children
+        assert children is not None
+        owned_goto: set[int] = set()
+        owned_children: set[int] = set()
+
+        def own_goto(state: int) -> dict[str, int]:
+            if state not in owned_goto:
+                goto[state] = dict(goto[state])
+                owned_goto.add(state)
+            return goto[state]
+
+        def own_children(state: int) -> set[int]:
+            if state not in owned_children:
+                children[state] = set(children[state])
+                owned_children.add(state)
+            return children[state]
+
+        def set_fail(state: int, target: int) -> None:
+            own_children(fail[state]).discard(state)
+            fail[state] = target
+            own_children(target).add(state)
+
+        dirty: list[int] = []
+        # 词尾标记变化、新增或删除的节点，用于判断是否需要重建候选起点过滤
+        changed: list[int] = []
+
+        # 删除: 取消词尾标记，并剪掉不再通向任何词的分支
+        removed: list[int] = []
+        for word in remove_words:
+            count = self._counts.get(word)
+            if not count:
+                continue
+            if count > 1:
+                self._counts[word] = count - 1
+                continue
+            del self._counts[word]
+            state = 0
+            for char in word:
+                state = goto[state][char]
+            is_end[state] = False
+            dirty.append(state)
+            changed.append(state)
+            while state and not is_end[state] and not goto[state]:
+                up = parent[state]
+                own_goto(up).pop(labels[state][-1])
+                parent[state] = -1
+                removed.append(state)
+                state = up
+
+        # 被剪掉的节点由深到浅处理，其失败指针的子节点改指向下一个后缀
+        removed.sort(key=depth.__getitem__, reverse=True)
+        for state in removed:
+            target = fail[state]
+            for child in list(children[state]):
+                set_fail(child, target)
+                dirty.append(child)
+            own_children(target).discard(state)
+            children[state] = set()
+            owned_children.add(state)
+
+        # 添加: 先插入 trie，再按深度计算新节点的失败指针
+        created: list[int] = []
+        for word in add_words:
+            if not word:
+                continue
+            if word in self._counts:
+                self._counts[word] += 1
+                continue
+            self._counts[word] = 1
+            state = 0
+            for char in word:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    own_goto(state)[char] = nxt
+                    goto.append({})
+                    owned_goto.add(nxt)
+                    fail.append(0)
+                    depth.append(depth[state] + 1)
+                    is_end.append(False)
+                    parent.append(state)
+                    labels.append(labels[state] + char)
+                    self._match_len.append(0)
+                    children.append(set())
+                    owned_children.add(nxt)
+                    created.append(nxt)
+                state = nxt
+            is_end[state] = True
+            dirty.append(state)
+            changed.append(state)
+
+        created.sort(key=depth.__getitem__)
+        for state in created:
+            char = labels[state][-1]
+            up = parent[state]
+            target = 0
+            if up:
+                f = fail[up]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(char, 0)
+            fail[state] = target
+            own_children(target).add(state)
+            # 原先指向 target 且以新节点为后缀的节点，改为指向新节点
+            label = labels[state]
+            for other in list(children[target]):
+                if other != state and labels[other].endswith(label):
+                    set_fail(other, state)
+                    dirty.append(other)
+            dirty.append(state)
+
+        # 在失败指针树上自上而下重新计算受影响子树的 match_len
+        match_len = self._match_len
+        visited: set[int] = set()
+        dirty.sort(key=depth.__getitem__)
+        for root in dirty:
+            if root in visited or (root and parent[root] < 0):
+                continue
+            stack = [root]
+            while stack:
+                state = stack.pop()
+                if state in visited:
+                    continue
+                visited.add(state)
+                if is_end[state]:
+                    match_len[state] = depth[state]
+                else:
+                    match_len[state] = match_len[fail[state]] if state else 0
+                stack.extend(children[state])
+
+        # 候选起点过滤只与前两层节点有关
+        if any(depth[state] <= 2 for state in (*changed, *created, *removed)):
+            self._build_candidates()
@@ -0,0 +1,86 @@
+import re
+from collections.abc import Iterable
+from typing import Optional
+
+# 文本中的域名，可带协议、端口和路径
+HOST_PATTERN = re.compile(
+    r"(?<![a-z0-9.-])(?:[a-z][a-z0-9+.-]*://)?"
+    r"((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63})(?![a-z0-9-])",
+    re.IGNORECASE,
+)
+
+
+def normalize_domain(domain: str) -> str:
+    """
+    规范化黑名单中的域名
+
+    去掉协议、路径、端口和开头的 "*."，转为小写
+
+    Args:
+        domain: 域名或网址
+
+    Returns:
+        规范化后的域名，无法识别时返回空字符串
+    """
+    domain = domain.strip().lower()
+    if "://" in domain:
+        domain = domain.split("://", 1)[1]
+    domain = domain.split("/", 1)[0].split(":", 1)[0]
+    return domain.lstrip("*").strip(".")
+
+
+class DomainBlocklist:
+    """域名黑名单
+
+    黑名单中的域名同时匹配其所有子域名
+    """
+
+    def __init__(self, domains: Iterable[str] = ()) -> None:
+        """
+        初始化黑名单
+
+        Args:
+            domains: 域名或网址列表
+        """
+        self._domains = {
+            normalized for normalized in map(normalize_domain, domains) if normalized
+        }
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def match_host(self, host: str) -> Optional[str]:
+        """
+        判断域名是否在黑名单中
+
+        Args:
+            host: 域名
+
+        Returns:
+            命中的黑名单域名，未命中时返回None
+        """
+        labels = host.lower().rstrip(".").split(".")
+        for index in range(len(labels)):
+            suffix = ".".join(labels[index:])
+            if suffix in self._domains:
+                return suffix
+        return None
+
+    def scan(self, text: str) -> list[str]:
+        """
+        查找文本中出现的黑名单域名
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            命中的黑名单域名列表，按首次出现的顺序去重
+        """
+        if not self._domains or "." not in text:
+            return []
+        matches: list[str] = []
+        for host in HOST_PATTERN.findall(text):
+            domain = self.match_host(host)
+            if domain is not None and domain not in matches:
+                matches.append(domain)
+        return matches
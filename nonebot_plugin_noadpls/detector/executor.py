@@ -0,0 +1,187 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Optional
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class CheckExecutor:
+    """检测任务执行器(文本检测、OCR 共用)
+
+    - inline: 直接在事件循环中同步执行
+    - thread: 在线程池中执行，事件循环只负责等待结果
+    - process: 在进程池(fork)中执行，子进程继承父进程中已构建好的匹配结构
+
+    排队和执行中的任务总数不超过 queue_size，超出时调用方等待空位(背压)，
+    等待期间事件循环可以继续处理其他事件
+
+    超时或被取消的任务: 尚未开始的直接取消，已经开始的由工作线程/进程执行完，
+    在此之前仍占用队列名额，避免卡住的任务越积越多
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        mode: str = "thread",
+        max_workers: int = 2,
+        queue_size: int = 64,
+        prepare: Optional[Callable[[], None]] = None,
+        initializer: Optional[Callable[[], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        初始化执行器
+
+        Args:
+            func: 任务函数，process 模式下必须是模块级函数
+            mode: 执行模式，inline/thread/process
+            max_workers: 线程或进程数
+            queue_size: 同时排队和执行的最大任务数
+            prepare: process 模式下创建进程池(fork)之前调用，用于预先构建匹配结构
+            initializer: 每个工作线程/进程启动时调用，用于加载各自持有的资源
+            timeout: 单个任务的超时时间(秒)，None 表示不限制，inline 模式下无效
+        """
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"未知的执行模式: {mode}")
+        # 不支持 fork 的平台上子进程无法继承匹配结构，退回线程池
+        if mode == "process" and "fork" not in multiprocessing.get_all_start_methods():
+            mode = "thread"
+        self.func = func
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(1, queue_size)
+        self.prepare = prepare
+        self.initializer = initializer
+        self.timeout = timeout
+        self.pending = 0
+        self.waiting = 0
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_pool(self) -> Executor:
+        """获取进程池/线程池，首次调用时创建"""
+        if self._pool is None:
+            if self.mode == "process":
+                if self.prepare is not None:
+                    self.prepare()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("fork"),
+                    initializer=self.initializer,
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="noadpls-worker",
+                    initializer=self.initializer,
+                )
+        return self._pool
+
+    async def run(self, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        执行任务，队列已满时等待空位
+
+        Args:
+            args: 传给任务函数的参数
+            timeout: 单独指定本次任务的超时时间(秒)，0 表示不限制，None 使用执行器的设置
+
+        Returns:
+            任务函数的返回值
+
+        Raises:
+            asyncio.TimeoutError: 任务超时
+        """
+        if self.mode == "inline":
+            return self.func(*args)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        if self._slots.locked():
+            self.waiting += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._submit(*args)
+        except BaseException:
+            self._release()
+            raise
+        # 名额在任务真正结束(或被取消)后才归还
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                self.timeout if timeout is None else timeout or None,
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            future.cancel()
+            raise
+
+    def _submit(self, *args: Any) -> Future:
+        """提交任务，工作进程异常退出导致进程池损坏时重建一次"""
+        try:
+            return self._get_pool().submit(self.func, *args)
+        except BrokenExecutor:
+            self._pool = None
+            return self._get_pool().submit(self.func, *args)
+
+    def _release(self) -> None:
+        """归还一个队列名额"""
+        self.pending -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        """在工作线程的回调中归还名额"""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def restart(self) -> None:
+        """
+        匹配结构更新后调用
+
+        process 模式下旧进程池在执行完已提交的任务后退出，之后的任务由重新 fork 的进程执行；
+        其他模式共享内存，无需处理
+        """
+        if self.mode != "process" or self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """关闭进程池/线程池"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取执行器状态
+
+        Returns:
+            包含执行模式、执行中及等待中任务数的字典
+        """
+        return {
+            "mode": self.mode,
+            "timeout": self.timeout,
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "waiting": self.waiting,
+        }
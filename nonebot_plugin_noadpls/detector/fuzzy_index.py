@@ -0,0 +1,192 @@
+from collections import Counter
+from typing import Optional
+
+from fuzzywuzzy import fuzz, process
+from fuzzywuzzy.utils import full_process
+
+
+class FuzzyIndex:
+    """模糊匹配候选索引
+
+    按处理后的词长分桶，桶内建立字符倒排表(字符 -> [(词序号, 出现次数)])
+
+    fuzz.ratio 的分数为 2*M/(len1+len2)，M 不超过两串共有字符数(按多重集计)，
+    据此只保留理论上能达到阈值的候选词，再对候选词精确打分
+
+    构建完成后不再原地修改，with_changes 以写时复制的方式生成新索引，
+    删除的词只做标记，标记过多时整体重建
+    """
+
+    def __init__(self, words: list[str]) -> None:
+        """
+        构建索引
+
+        Args:
+            words: 违禁词列表，顺序决定同分时的取舍(与 process.extractOne 一致)
+        """
+        self._words: list[str] = []
+        self._processed: list[str] = []
+        self._buckets: dict[int, dict[str, list[tuple[int, int]]]] = {}
+        # 已删除的词序号
+        self._removed: set[int] = set()
+        # 处理后为空串的词，只会与同样为空的查询完全相等
+        self._first_empty: Optional[int] = None
+        for word in words:
+            self._append(word)
+
+    def _append(self, word: str, owned: Optional[set[tuple[int, str]]] = None) -> None:
+        """追加一个词，owned 不为None时只修改已复制过的倒排表"""
+        index = len(self._words)
+        processed = full_process(word)
+        self._words.append(word)
+        self._processed.append(processed)
+        if not processed:
+            if self._first_empty is None:
+                self._first_empty = index
+            return
+        length = len(processed)
+        bucket = self._buckets.get(length)
+        if owned is not None and (length, "") not in owned:
+            # 空字符作为桶本身的标记
+            bucket = self._buckets[length] = dict(bucket or {})
+            owned.add((length, ""))
+        elif bucket is None:
+            bucket = self._buckets[length] = {}
+        for char, count in Counter(processed).items():
+            postings = bucket.get(char)
+            if postings is None:
+                postings = bucket[char] = []
+            elif owned is not None and (length, char) not in owned:
+                postings = bucket[char] = list(postings)
+            if owned is not None:
+                owned.add((length, char))
+            postings.append((index, count))
+
+    @property
+    def words(self) -> list[str]:
+        """未删除的词，保持原有顺序"""
+        if not self._removed:
+            return self._words
+        return [w for i, w in enumerate(self._words) if i not in self._removed]
+
+    def __len__(self) -> int:
+        return len(self._words) - len(self._removed)
+
+    def with_changes(
+        self,
+        add_words: Optional[list[str]] = None,
+        remove_words: Optional[list[str]] = None,
+    ) -> "FuzzyIndex":
+        """
+        增量增删词，返回新的索引，自身保持不变
+
+        新词追加在末尾，删除的词取最后一次出现的位置
+
+        Args:
+            add_words: 需要添加的词
+            remove_words: 需要删除的词
+
+        Returns:
+            更新后的索引
+        """
+        new = object.__new__(FuzzyIndex)
+        new._words = list(self._words)
+        new._processed = list(self._processed)
+        new._buckets = dict(self._buckets)
+        new._removed = set(self._removed)
+        new._first_empty = self._first_empty
+
+        for word in remove_words or []:
+            for index in range(len(new._words) - 1, -1, -1):
+                if new._words[index] == word and index not in new._removed:
+                    new._removed.add(index)
+                    break
+        if new._first_empty in new._removed:
+            new._first_empty = next(
+                (
+                    i
+                    for i, p in enumerate(new._processed)
+                    if not p and i not in new._removed
+                ),
+                None,
+            )
+
+        owned: set[tuple[int, str]] = set()
+        for word in add_words or []:
+            new._append(word, owned)
+
+        # 删除标记超过一半时整体重建，避免倒排表无限膨胀
+        if len(new._removed) * 2 > len(new._words):
+            return FuzzyIndex(new.words)
+        return new
+
+    def candidates(self, processed_query: str, min_score: int) -> list[int]:
+        """
+        获取可能达到阈值的候选词序号
+
+        Args:
+            processed_query: 经过 full_process 处理的查询串
+            min_score: 最低分数阈值
+
+        Returns:
+            升序排列的词序号列表
+        """
+        query_len = len(processed_query)
+        query_counts = Counter(processed_query)
+        # round(100 * 2M / total) >= min_score 要求 400M >= (2*min_score-1)*total
+        factor = 2 * min_score - 1
+        removed = self._removed
+        result = []
+        for length, bucket in self._buckets.items():
+            total = query_len + length
+            if 400 * min(query_len, length) < factor * total:
+                continue
+            shared: dict[int, int] = {}
+            for char, query_count in query_counts.items():
+                for index, count in bucket.get(char, ()):
+                    shared[index] = shared.get(index, 0) + min(query_count, count)
+            limit = factor * total
+            result.extend(
+                index
+                for index, m in shared.items()
+                if 400 * m >= limit and index not in removed
+            )
+        result.sort()
+        return result
+
+    def extract_one(self, query: str, min_score: int) -> Optional[tuple[str, int]]:
+        """
+        获取得分最高且不低于阈值的词
+
+        结果与 process.extractOne(query, words, scorer=fuzz.ratio) 再按阈值过滤一致
+
+        Args:
+            query: 查询串
+            min_score: 最低分数阈值(0-100)
+
+        Returns:
+            (违禁词, 分数)，没有达到阈值的词时返回None
+        """
+        if min_score <= 0:
+            result = process.extractOne(query, self.words, scorer=fuzz.ratio)
+            if not result or result[1] < min_score:
+                return None
+            return result[0], result[1]
+
+        processed_query = full_process(query)
+        if not processed_query:
+            if self._first_empty is None:
+                return None
+            return self._words[self._first_empty], 100
+
+        best_index = -1
+        best_score = -1
+        for index in self.candidates(processed_query, min_score):
+            score = fuzz.ratio(processed_query, self._processed[index])
+            if score > best_score:
+                best_index = index
+                best_score = score
+
+        if best_score < min_score:
+            return None
+        return self._words[best_index], best_score
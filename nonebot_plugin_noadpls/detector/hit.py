@@ -0,0 +1,26 @@
+from enum import Enum
+from typing import NamedTuple
+
+
+class MatchLayer(str, Enum):
+    """命中所在的检测层级"""
+
+    RAW = "raw"
+    "原始文本精确匹配"
+    NORMALIZED = "normalized"
+    "预处理后文本精确匹配"
+    FUZZY = "fuzzy"
+    "分词模糊匹配"
+    REGEX = "regex"
+    "自定义正则匹配"
+    DOMAIN = "domain"
+    "域名黑名单匹配"
+
+
+class Hit(NamedTuple):
+    """单条命中结果"""
+
+    layer: MatchLayer
+    "命中层级"
+    word: str
+    "命中的违禁词(正则层为 re:模式: 匹配结果，域名层为 domain:域名)"
@@ -0,0 +1,99 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Optional
+
+from opencc import OpenCC
+
+
+def _compose(first: dict[int, str], second: dict[int, str]) -> dict[int, str]:
+    """合并两张 str.translate 映射表，效果等同于先后各 translate 一次"""
+    composed = {key: value.translate(second) for key, value in first.items()}
+    for key, value in second.items():
+        composed.setdefault(key, value)
+    return composed
+
+
+class Normalizer:
+    """文本规范化流水线
+
+    NFKC 规范化 -> (过滤前替换表) -> 字符过滤 -> 替换表 -> 繁简转换
+
+    正则预编译、替换表合并为单次 translate、繁简转换器常驻，
+    新增替换表只会合并进已有的映射表，不会增加处理次数
+    """
+
+    def __init__(
+        self,
+        strip_pattern: str,
+        replace_pairs: Optional[dict[str, str]] = None,
+        opencc_config: Optional[str] = "t2s",
+        cache_size: int = 0,
+    ) -> None:
+        """
+        初始化规范化流水线
+
+        Args:
+            strip_pattern: 需要移除的字符的正则(字符类)
+            replace_pairs: 字符替换表 {原字符: 替换结果}，替换结果不会被同一张表再次替换
+            opencc_config: OpenCC 转换配置，None 表示不做繁简转换
+            cache_size: 结果缓存条数，0 表示不缓存
+        """
+        self._strip_pattern = re.compile(strip_pattern)
+        self._pre_table: dict[int, str] = {}
+        self._table: dict[int, str] = {}
+        self._converter = OpenCC(opencc_config) if opencc_config else None
+        self._cache_size = cache_size
+        if replace_pairs:
+            self.add_table(replace_pairs)
+        self._reset_cache()
+
+    def _reset_cache(self) -> None:
+        """替换表变化后重建缓存"""
+        if self._cache_size > 0:
+            self._cached = lru_cache(maxsize=self._cache_size)(self._normalize)
+        else:
+            self._cached = self._normalize
+
+    def add_table(self, pairs: dict[str, str], before_filter: bool = False) -> None:
+        """
+        追加一张替换表，在已有替换之后生效
+
+        Args:
+            pairs: 替换表 {原字符: 替换结果}，原字符必须是单个字符
+            before_filter: 是否在字符过滤之前替换(如形近字母、特殊符号)
+        """
+        table = str.maketrans(pairs)
+        if before_filter:
+            self._pre_table = _compose(self._pre_table, table)
+        else:
+            self._table = _compose(self._table, table)
+        self._reset_cache()
+
+    def _normalize(self, text: str) -> str:
+        result = unicodedata.normalize("NFKC", text)
+        if self._pre_table:
+            result = result.translate(self._pre_table)
+        result = self._strip_pattern.sub("", result)
+        if self._table:
+            result = result.translate(self._table)
+        if self._converter is not None:
+            result = self._converter.convert(result)
+        return result
+
+    def normalize(self, text: str) -> str:
+        """
+        规范化文本
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            规范化后的文本
+        """
+        return self._cached(text)
+
+    def cache_info(self) -> Optional[tuple]:
+        """获取缓存命中统计，未启用缓存时返回None"""
+        cache_info = getattr(self._cached, "cache_info", None)
+        return cache_info() if cache_info else None
@@ -0,0 +1,179 @@
+import re
+from re import Pattern
+from typing import Any, Optional
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python 3.10
+    import sre_parse  # type: ignore[no-redef]
+
+_LITERAL = sre_parse.LITERAL
+_SUBPATTERN = sre_parse.SUBPATTERN
+_REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+_GROUPREFS = (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS)
+
+
+def _literal_runs(items: Any) -> list[str]:
+    """提取匹配时一定会出现的连续字面量片段"""
+    runs: list[str] = []
+    current: list[str] = []
+    for op, av in items:
+        if op is _LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is _SUBPATTERN:
+            runs.extend(_literal_runs(av[-1]))
+        elif op is _ATOMIC_GROUP:
+            runs.extend(_literal_runs(av))
+        elif op in _REPEATS and av[0] >= 1:
+            runs.extend(_literal_runs(av[2]))
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def _has_groupref(items: Any) -> bool:
+    """判断解析结果中是否存在反向引用"""
+    for item in items:
+        if isinstance(item, tuple) and item:
+            if any(item[0] is op for op in _GROUPREFS):
+                return True
+        if isinstance(item, (list, tuple, sre_parse.SubPattern)):
+            if _has_groupref(item):
+                return True
+    return False
+
+
+def required_literal(pattern: str, flags: int = 0) -> Optional[str]:
+    """
+    获取正则表达式匹配时必然包含的最长字面量(已 casefold)
+
+    只使用 casefold 后仍为单个字符的字面量，保证忽略大小写时不会漏判
+
+    Args:
+        pattern: 正则表达式字符串
+        flags: 编译标志
+
+    Returns:
+        必然出现的字面量，无法确定时返回None
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    best = None
+    for run in _literal_runs(parsed):
+        if any(len(char.casefold()) != 1 for char in run):
+            continue
+        if best is None or len(run) > len(best):
+            best = run
+    return best.casefold() if best else None
+
+
+class RegexEngine:
+    """自定义正则规则的合并匹配器
+
+    - 有必需字面量的规则: 先在 casefold 后的文本中查找字面量，不存在则跳过
+    - 其余可合并的规则: 合并为一个分支正则，一次扫描判断是否可能命中
+    - 无法合并的规则(反向引用、命名分组、全局内联标志等): 单独匹配
+
+    可能命中的规则再各自 findall 一次得到匹配结果
+    """
+
+    def __init__(self, compiled: dict[str, Pattern], flags: int = re.IGNORECASE):
+        """
+        构建合并匹配器
+
+        Args:
+            compiled: 已编译的正则 {模式字符串: 编译后的模式}，顺序即结果顺序
+            flags: 编译标志，需与 compiled 一致
+        """
+        self.compiled = compiled
+        self._literals: dict[str, str] = {}
+        mergeable: list[str] = []
+        self._standalone: list[str] = []
+
+        for pattern, compiled_pattern in compiled.items():
+            literal = required_literal(pattern, flags)
+            if literal:
+                self._literals[pattern] = literal
+            elif self._can_merge(pattern, compiled_pattern, flags):
+                mergeable.append(pattern)
+            else:
+                self._standalone.append(pattern)
+
+        self._merged: Optional[Pattern] = None
+        self._merged_patterns: list[str] = []
+        if mergeable:
+            try:
+                self._merged = re.compile(
+                    "|".join(f"(?:{pattern})" for pattern in mergeable), flags
+                )
+                self._merged_patterns = mergeable
+            except re.error:
+                self._standalone.extend(mergeable)
+
+    @staticmethod
+    def _can_merge(pattern: str, compiled_pattern: Pattern, flags: int) -> bool:
+        """判断规则能否放进合并的分支正则"""
+        if compiled_pattern.groupindex:
+            return False
+        try:
+            re.compile(f"(?:{pattern})", flags)
+            return not _has_groupref(sre_parse.parse(pattern, flags))
+        except Exception:
+            return False
+
+    def __len__(self) -> int:
+        return len(self.compiled)
+
+    def candidates(self, text: str) -> set[str]:
+        """
+        获取可能命中的规则
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            可能命中的模式字符串集合
+        """
+        result = set(self._standalone)
+        if self._literals:
+            folded = text.casefold()
+            result.update(
+                pattern
+                for pattern, literal in self._literals.items()
+                if literal in folded
+            )
+        if self._merged is not None and self._merged.search(text):
+            result.update(self._merged_patterns)
+        return result
+
+    def scan(self, text: str) -> list[tuple[str, list]]:
+        """
+        扫描文本，返回命中的规则及其全部匹配
+
+        Args:
+            text: 要检查的文本
+
+        Returns:
+            [(模式字符串, findall结果)]，按规则顺序排列
+        """
+        candidates = self.candidates(text)
+        if not candidates:
+            return []
+        matches = []
+        for pattern, compiled_pattern in self.compiled.items():
+            if pattern in candidates:
+                found = compiled_pattern.findall(text)
+                if found:
+                    matches.append((pattern, found))
+        return matches
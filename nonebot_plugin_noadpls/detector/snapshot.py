@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+from typing import NamedTuple, Optional
+
+from .automaton import WordAutomaton
+from .fuzzy_index import FuzzyIndex
+
+# 快照格式版本，结构变化时递增使旧快照失效
+SNAPSHOT_VERSION = 1
+
+
+class DetectorSnapshot(NamedTuple):
+    """构建完成的检测结构快照"""
+
+    fingerprint: str
+    """构建时词库的指纹"""
+    automaton: WordAutomaton
+    """精确匹配自动机"""
+    fuzzy_index: FuzzyIndex
+    """模糊匹配候选索引"""
+    library_words: list[str]
+    """预定义词库中的词"""
+
+
+def fingerprint(libraries: list[pathlib.Path], custom_words: list[str]) -> str:
+    """
+    计算词库指纹
+
+    预定义词库按路径、大小和修改时间计入，词库文件更新后指纹随之变化
+
+    Args:
+        libraries: 预定义词库文件路径
+        custom_words: 自定义违禁词
+
+    Returns:
+        十六进制指纹
+    """
+    files = []
+    for library in libraries:
+        try:
+            stat = library.stat()
+            files.append([str(library), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            files.append([str(library), None, None])
+    payload = json.dumps(
+        [SNAPSHOT_VERSION, files, custom_words], ensure_ascii=False
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def load_snapshot(path: pathlib.Path, expected: str) -> Optional[DetectorSnapshot]:
+    """
+    一次读入并还原快照
+
+    Args:
+        path: 快照文件路径
+        expected: 当前词库的指纹
+
+    Returns:
+        指纹一致时返回快照，不存在、损坏或已过期时返回None
+    """
+    try:
+        version, snapshot = pickle.loads(path.read_bytes())
+    except Exception:
+        return None
+    if version != SNAPSHOT_VERSION or not isinstance(snapshot, DetectorSnapshot):
+        return None
+    if snapshot.fingerprint != expected:
+        return None
+    return snapshot
+
+
+def save_snapshot(path: pathlib.Path, snapshot: DetectorSnapshot) -> None:
+    """
+    保存快照，先写临时文件再替换，避免留下写了一半的文件
+
+    Args:
+        path: 快照文件路径
+        snapshot: 要保存的快照
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(
+            pickle.dumps((SNAPSHOT_VERSION, snapshot), pickle.HIGHEST_PROTOCOL)
+        )
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class VerdictCache:
+    """检测结果 LRU 缓存
+
+    以文本的 blake2b 摘要为键，每条结果记录写入时的词库版本号，
+    词库更新后调用 bump_version 即可让旧结果全部失效
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最多缓存的结果条数，0 表示不缓存
+        """
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[bytes, tuple[int, tuple]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, text: str) -> Optional[list]:
+        """
+        获取缓存的检测结果
+
+        Args:
+            text: 检测的文本
+
+        Returns:
+            检测结果，未命中或已过期时返回None
+        """
+        if self.maxsize <= 0:
+            return None
+        key = self._key(text)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != self.version:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, text: str, verdict: list, version: Optional[int] = None) -> None:
+        """
+        写入检测结果
+
+        Args:
+            text: 检测的文本
+            verdict: 检测结果
+            version: 开始检测时的词库版本号，与当前版本不一致时不写入
+        """
+        if self.maxsize <= 0:
+            return
+        key = self._key(text)
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._data[key] = (self.version, tuple(verdict))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def bump_version(self) -> None:
+        """词库变化后调用，使之前的结果全部失效"""
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含命中次数、未命中次数等统计数据的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
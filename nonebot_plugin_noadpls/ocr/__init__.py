@@ -1,4 +1,75 @@
+from .api_ocr import close_client as close_online_ocr_client
 from .api_ocr import online_ocr as online_ocr
+from .backends import CircuitBreaker as CircuitBreaker
+from .backends import OcrBackend as OcrBackend
+from .backends import OcrChain as OcrChain
+from .backends import OcrUnavailableError as OcrUnavailableError
+from .backends import get_backend as get_backend
+from .backends import register_backend as register_backend
+from .fetch import ImageFetchError as ImageFetchError
+from .fetch import ImageRejectedError as ImageRejectedError
+from .fetch import close_client as close_fetch_client
+from .fetch import fetch_image as fetch_image
+from .ocr import PartialText as PartialText
 from .ocr import recognize_image as local_ocr
+from .ocr import set_early_exit as set_early_exit
+from .pool import OcrEngineLoadingError as OcrEngineLoadingError
+from .pool import OcrEngineState as OcrEngineState
+from .pool import chain_ocr as chain_ocr
+from .pool import decode_image_async as decode_image_async
+from .pool import find_similar_image as find_similar_image
+from .pool import get_engine_state as get_engine_state
+from .pool import image_index as image_index
+from .pool import local_ocr_async as local_ocr_async
+from .pool import may_contain_text as may_contain_text
+from .pool import ocr_chain as ocr_chain
+from .pool import ocr_executor as ocr_executor
+from .pool import qr_scanner as qr_scanner
+from .pool import refresh_ocr_workers as refresh_ocr_workers
+from .pool import remember_image as remember_image
+from .pool import scan_qr_codes as scan_qr_codes
+from .pool import start_ocr_warm_up as start_ocr_warm_up
+from .pool import text_gate as text_gate
+from .pool import wait_ocr_engine as wait_ocr_engine
+from .pool import warm_up_ocr as warm_up_ocr
+from .preprocess import DecodedImage as DecodedImage
+from .preprocess import ImageTooLargeError as ImageTooLargeError
 
-__all__ = ["local_ocr", "online_ocr"]
+__all__ = [
+    "CircuitBreaker",
+    "DecodedImage",
+    "ImageFetchError",
+    "ImageRejectedError",
+    "ImageTooLargeError",
+    "OcrBackend",
+    "OcrChain",
+    "OcrEngineLoadingError",
+    "OcrEngineState",
+    "OcrUnavailableError",
+    "PartialText",
+    "chain_ocr",
+    "close_fetch_client",
+    "close_online_ocr_client",
+    "decode_image_async",
+    "fetch_image",
+    "find_similar_image",
+    "get_backend",
+    "get_engine_state",
+    "image_index",
+    "local_ocr",
+    "local_ocr_async",
+    "may_contain_text",
+    "ocr_chain",
+    "ocr_executor",
+    "online_ocr",
+    "qr_scanner",
+    "refresh_ocr_workers",
+    "register_backend",
+    "remember_image",
+    "scan_qr_codes",
+    "set_early_exit",
+    "start_ocr_warm_up",
+    "text_gate",
+    "wait_ocr_engine",
+    "warm_up_ocr",
+]
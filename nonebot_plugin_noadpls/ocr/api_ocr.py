@@ -1,12 +1,15 @@
 # Original by https://github.com/canxin121/nonebot_paddle_ocr/blob/main/nonebot_paddle_ocr/api_ocr.py
 
+import asyncio
 import base64
 import datetime
 import hashlib
+import random
 from typing import Optional
 
 import httpx  # 导入 httpx
 
+from nonebot_plugin_noadpls.config import config
 from nonebot_plugin_noadpls.utils.cache import save_cache
 from nonebot_plugin_noadpls.utils.constants import PrefixConstants
 from nonebot_plugin_noadpls.utils.log import log
@@ -28,41 +31,92 @@ def timestamp_to_utc(timestamp: float) -> str:
     return utc_str
 
 
-def api_paddle_ocr(img) -> str:
-    # 定义请求的url和headers
-    url = "https://www.paddlepaddle.org.cn/paddlehub-api/image_classification/chinese_ocr_db_crnn_mobile"
-    headers = {
-        "Content-Type": "application/json",
-        "Origin": "https://www.paddlepaddle.org.cn",
-        "Accept-Encoding": "gzip, deflate, br",
-        # "Cookie": "Hm_lpvt_89be97848720f62fa00a07b1e0d83ae6=1680262774; Hm_lvt_89be97848720f62fa00a07b1e0d83ae6=1680262716",
-        "Connection": "keep-alive",
-        "Accept": "*/*",
-        "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/605.1.15",
-        "Referer": "https://www.paddlepaddle.org.cn/hub/scene/ocr",
-        # "Content-Length": "176200", # httpx 会自动处理 Content-Length
-        "Accept-Language": "zh-CN,zh-Hans;q=0.9",
-    }
-    # 定义两个时间戳
-    Hm_lpvt = 1680262774
-    Hm_lvt = 1680262716
-    # 调用函数，得到两个日期字符串
-    Hm_lpvt_utc = timestamp_to_utc(Hm_lpvt)
-    Hm_lvt_utc = timestamp_to_utc(Hm_lvt)
-    # 将两个日期字符串拼接成Cookie的Expires属性，并添加到headers中
-    headers["Cookie"] = (
-        f"Hm_lpvt_89be97848720f62fa00a07b1e0d83ae6={Hm_lpvt_utc}; Hm_lvt_89be97848720f62fa00a07b1e0d83ae6={Hm_lvt_utc}"
-    )
+# 定义两个时间戳
+Hm_lpvt = 1680262774
+Hm_lvt = 1680262716
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Origin": "https://www.paddlepaddle.org.cn",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Accept": "*/*",
+    "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/605.1.15",
+    "Referer": "https://www.paddlepaddle.org.cn/hub/scene/ocr",
+    "Accept-Language": "zh-CN,zh-Hans;q=0.9",
+    # 将两个日期字符串拼接成Cookie的Expires属性
+    "Cookie": (
+        f"Hm_lpvt_89be97848720f62fa00a07b1e0d83ae6={timestamp_to_utc(Hm_lpvt)}; "
+        f"Hm_lvt_89be97848720f62fa00a07b1e0d83ae6={timestamp_to_utc(Hm_lvt)}"
+    ),
+}
+
+# 重试间隔基数(秒)，第 n 次重试等待约 base * 2^n
+RETRY_BACKOFF = 0.5
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """获取长期复用的 keep-alive 客户端，首次调用时创建"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=config.env.ocr_api_timeout,
+            limits=httpx.Limits(
+                max_connections=config.env.ocr_api_max_connections,
+                max_keepalive_connections=config.env.ocr_api_max_connections,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """关闭客户端，释放连接池"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def api_paddle_ocr(img: bytes) -> str:
+    """调用在线OCR接口识别图片
+
+    服务端 5xx 或网络错误时按指数退避重试
+
+    Args:
+        img: 图像的二进制数据
+
+    Returns:
+        识别的文本内容
+
+    Raises:
+        httpx.HTTPStatusError: 请求失败且重试次数用尽
+        httpx.TransportError: 网络错误且重试次数用尽
+    """
+    url = config.env.ocr_api_url
+    retries = max(0, config.env.ocr_api_retries)
 
     # 将图片内容转换为base64编码
     pic_base64 = base64.b64encode(img)
     # 定义请求的数据，使用base64编码的图片
     data = {"image": pic_base64.decode()}
 
-    # 使用 httpx 发送同步 post 请求
-    with httpx.Client(timeout=30.0) as client:
-        response = client.post(url, headers=headers, json=data)
-        response.raise_for_status()  # 检查请求是否成功
+    client = get_client()
+    for attempt in range(retries):
+        try:
+            response = await client.post(url, json=data)
+            if response.status_code < 500:
+                break
+            log.warning(f"在线OCR服务端错误: {response.status_code}，准备重试")
+        except httpx.TransportError as e:
+            log.warning(f"在线OCR网络错误: {e!r}，准备重试")
+        await asyncio.sleep(RETRY_BACKOFF * 2**attempt * (1 + random.random()))
+    else:
+        # 最后一次尝试，网络错误直接抛出
+        response = await client.post(url, json=data)
+    response.raise_for_status()  # 检查请求是否成功
 
     results = response.json()["result"][0]["data"]
     text = " "
@@ -73,14 +127,14 @@ def api_paddle_ocr(img) -> str:
     return text
 
 
-def online_ocr(image_data: bytes, cache_key: Optional[str] = None) -> str:
+async def online_ocr(image_data: bytes, cache_key: Optional[str] = None) -> str:
     # 如果没有提供缓存键，使用图像数据的哈希值作为缓存键
     if not cache_key:
         cache_key = (
             f"{PrefixConstants.OCR_RESULT_TEXT}{hashlib.sha512(image_data).hexdigest()}"
         )
     try:
-        text = api_paddle_ocr(image_data)
+        text = await api_paddle_ocr(image_data)
 
         save_cache(cache_key, text, PrefixConstants.OCR_CACHE_TTL)
         log.info(f"OCR结果已缓存: {cache_key}")
@@ -102,7 +156,7 @@ if __name__ == "__main__":
         ) as pic:
             # 读取图片内容
             pic_data = pic.read()
-            print(api_paddle_ocr(pic_data))  # noqa:T201
+            print(asyncio.run(api_paddle_ocr(pic_data)))  # noqa:T201
     except FileNotFoundError:
         print("测试图片文件未找到，请确保路径正确。")  # noqa:T201
     except Exception as e:
@@ -0,0 +1,310 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable
+from typing import Any, Callable, Optional, Union
+
+from nonebot_plugin_noadpls.utils.log import log
+from nonebot_plugin_noadpls.utils.stats import percentile
+
+# 统计延迟分位数时保留的最近样本数
+LATENCY_SAMPLES = 1024
+
+RecognizeFunc = Callable[[bytes], Awaitable[str]]
+
+
+class OcrUnavailableError(RuntimeError):
+    """OCR 后端链中没有可用的后端或全部识别失败"""
+
+
+class CircuitBreaker:
+    """熔断器
+
+    连续失败 failure_threshold 次后断开，断开期间直接跳过；
+    reset_timeout 秒后放行一次试探调用，成功则恢复，失败则继续断开
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 断开前允许的连续失败次数
+            reset_timeout: 断开后多久放行试探调用(秒)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """closed / open / half_open"""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        是否放行本次调用
+
+        Returns:
+            闭合时，或半开且没有正在进行的试探调用时返回True
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """记录一次成功，恢复闭合"""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_cancel(self) -> None:
+        """调用被取消，不计入结果，但允许下一次试探"""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """记录一次失败，达到阈值或试探失败时断开"""
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class OcrBackend:
+    """OCR 后端，记录调用耗时和错误并带有熔断器"""
+
+    def __init__(
+        self,
+        name: str,
+        recognize: RecognizeFunc,
+        available: Union[bool, Callable[[], bool]] = True,
+    ) -> None:
+        """
+        初始化后端
+
+        Args:
+            name: 后端名称
+            recognize: 识别函数，失败时抛出异常
+            available: 后端是否可用(如依赖未安装、模型加载中)，可以是返回是否可用的函数，
+                不可用时跳过
+        """
+        self.name = name
+        self.recognize = recognize
+        self.available = available
+        self.breaker = CircuitBreaker()
+        self.slow_threshold = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.skipped = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def is_available(self) -> bool:
+        """后端当前是否可用"""
+        return self.available() if callable(self.available) else self.available
+
+    def configure(
+        self, failure_threshold: int, reset_timeout: float, slow_threshold: float
+    ) -> None:
+        """
+        设置熔断参数
+
+        Args:
+            failure_threshold: 断开前允许的连续失败次数
+            reset_timeout: 断开后多久放行试探调用(秒)
+            slow_threshold: 耗时超过该值(秒)的调用按失败计入熔断器，0 表示不限制
+        """
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.slow_threshold = slow_threshold
+
+    async def run(self, image_data: bytes) -> str:
+        """
+        调用后端识别并记录结果
+
+        Args:
+            image_data: 图像的二进制数据
+
+        Returns:
+            识别的文本内容
+
+        Raises:
+            Exception: 识别函数抛出的异常
+        """
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            text = await self.recognize(image_data)
+        except asyncio.CancelledError:
+            self.breaker.record_cancel()
+            raise
+        except Exception:
+            self.errors += 1
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+        if 0 < self.slow_threshold < self._latencies[-1]:
+            # 结果照常使用，但慢的后端之后会被跳过
+            self.slow += 1
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return text
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取后端统计信息
+
+        Returns:
+            包含调用次数、错误次数、熔断状态及耗时分位数(毫秒)的字典
+        """
+        latencies = list(self._latencies)
+        return {
+            "available": self.is_available(),
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "skipped": self.skipped,
+            "latency_p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+            "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        }
+
+
+_registry: dict[str, OcrBackend] = {}
+
+
+def register_backend(
+    name: str,
+    recognize: RecognizeFunc,
+    available: Union[bool, Callable[[], bool]] = True,
+) -> OcrBackend:
+    """
+    注册 OCR 后端，同名后端会被替换
+
+    Args:
+        name: 后端名称，在 ocr_backends 配置中引用
+        recognize: 识别函数，失败时抛出异常
+        available: 后端是否可用，可以是返回是否可用的函数
+
+    Returns:
+        注册的后端
+    """
+    backend = OcrBackend(name, recognize, available)
+    _registry[name] = backend
+    return backend
+
+
+def get_backend(name: str) -> Optional[OcrBackend]:
+    """按名称获取已注册的后端"""
+    return _registry.get(name)
+
+
+async def fake_ocr(image_data: bytes) -> str:
+    """
+    测试用的进程内后端，将图片数据按 UTF-8 解码作为识别结果
+
+    Args:
+        image_data: 图像的二进制数据
+
+    Returns:
+        识别的文本内容
+    """
+    return f" {image_data.decode('utf-8', errors='ignore')} "
+
+
+class OcrChain:
+    """按顺序尝试的 OCR 后端链
+
+    跳过不可用和熔断中的后端，失败时依次尝试下一个
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+        slow_threshold: float = 0.0,
+    ) -> None:
+        """
+        初始化后端链
+
+        Args:
+            names: 后端名称，按尝试顺序排列，名称在调用时才解析
+            failure_threshold: 断开前允许的连续失败次数
+            reset_timeout: 断开后多久放行试探调用(秒)
+            slow_threshold: 耗时超过该值(秒)的调用按失败计入熔断器，0 表示不限制
+        """
+        self.names = names
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_threshold = slow_threshold
+        self._configured: set[OcrBackend] = set()
+
+    def backends(self) -> list[OcrBackend]:
+        """
+        按顺序获取链上已注册的后端
+
+        Returns:
+            后端列表，未注册的名称被忽略
+        """
+        backends = []
+        for name in self.names:
+            backend = _registry.get(name)
+            if backend is None:
+                continue
+            if backend not in self._configured:
+                backend.configure(
+                    self.failure_threshold, self.reset_timeout, self.slow_threshold
+                )
+                self._configured.add(backend)
+            backends.append(backend)
+        return backends
+
+    async def recognize(self, image_data: bytes) -> str:
+        """
+        依次尝试各后端识别图像
+
+        Args:
+            image_data: 图像的二进制数据
+
+        Returns:
+            第一个成功的后端的识别结果
+
+        Raises:
+            OcrUnavailableError: 没有可用的后端或全部失败
+        """
+        errors = []
+        for backend in self.backends():
+            if not backend.is_available():
+                continue
+            if not backend.breaker.allow():
+                backend.skipped += 1
+                continue
+            try:
+                return await backend.run(image_data)
+            except Exception as e:
+                log.warning(f"OCR后端 {backend.name} 识别失败: {e!r}")
+                errors.append(f"{backend.name}: {e!r}")
+        raise OcrUnavailableError(
+            f"没有可用的OCR后端: {'; '.join(errors) or '全部不可用或熔断中'}"
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取链上各后端的统计信息
+
+        Returns:
+            后端名称到统计信息的字典
+        """
+        return {backend.name: backend.get_stats() for backend in self.backends()}
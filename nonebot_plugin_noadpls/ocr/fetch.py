@@ -0,0 +1,122 @@
+from typing import Optional
+
+import httpx
+
+from nonebot_plugin_noadpls.config import config
+from nonebot_plugin_noadpls.utils.cache import open_binary_cache
+
+# 常见图片格式的文件头
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"GIF87a",
+    b"GIF89a",
+    b"BM",  # BMP
+)
+# 判断文件头需要的字节数
+SIGNATURE_SIZE = 12
+# 每次读取的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """获取共享的图片下载客户端，首次调用时创建"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=config.env.image_max_connections,
+                max_keepalive_connections=config.env.image_max_connections,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """关闭图片下载客户端，释放连接池"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+class ImageFetchError(RuntimeError):
+    """图片下载失败"""
+
+
+class ImageRejectedError(ImageFetchError):
+    """图片过大或不是图片，下载已中止"""
+
+
+def is_image_header(head: bytes) -> bool:
+    """
+    根据文件头判断是否为图片
+
+    Args:
+        head: 文件开头的若干字节
+
+    Returns:
+        是否为支持的图片格式
+    """
+    if head.startswith(IMAGE_SIGNATURES):
+        return True
+    # WEBP: RIFF....WEBP
+    return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+
+
+async def fetch_image(
+    url: str,
+    cache_key: str,
+    max_bytes: int,
+    ttl: Optional[int] = None,
+) -> bytes:
+    """
+    流式下载图片并直接写入缓存
+
+    响应头声明的长度超出上限时不读取正文；文件头不是图片或读取量超出上限时
+    立即中止，已写入的部分不会留在缓存中
+
+    Args:
+        url: 图片地址
+        cache_key: 图片数据的缓存键
+        max_bytes: 允许的最大字节数，0 表示不限制
+        ttl: 缓存有效期(秒)，默认使用缓存管理器的设置
+
+    Returns:
+        图片的二进制数据
+
+    Raises:
+        ImageFetchError: 响应状态码不是200，或连接失败、超时
+        ImageRejectedError: 图片过大或不是图片
+    """
+    try:
+        async with get_client().stream("GET", url) as response:
+            if response.status_code != 200:
+                raise ImageFetchError(f"获取图像失败，状态码: {response.status_code}")
+            length = response.headers.get("Content-Length", "")
+            if max_bytes and length.isdigit() and int(length) > max_bytes:
+                raise ImageRejectedError(f"图片大小 {length} 字节超出上限 {max_bytes}")
+
+            chunks: list[bytes] = []
+            size = 0
+            with open_binary_cache(cache_key, ttl) as f:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    if size < SIGNATURE_SIZE <= size + len(chunk):
+                        head = b"".join(chunks) + chunk
+                        if not is_image_header(head):
+                            raise ImageRejectedError("文件头不是支持的图片格式")
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise ImageRejectedError(f"图片大小超出上限 {max_bytes} 字节")
+                    f.write(chunk)
+                    chunks.append(chunk)
+                if size < SIGNATURE_SIZE and not is_image_header(b"".join(chunks)):
+                    raise ImageRejectedError("文件头不是支持的图片格式")
+    except httpx.HTTPError as e:
+        # 连接失败、超时等网络错误
+        raise ImageFetchError(f"获取图像失败: {e!r}") from e
+    return b"".join(chunks)
@@ -1,58 +1,81 @@
 import hashlib
-import io
-from typing import Optional
-
-import numpy as np
-from PIL import Image
+import threading
+import time
+from typing import Any, Callable, Optional
 
 # 条件导入paddleocr，如果本地ocr不可用，不影响整体功能
 try:
     from paddleocr import PaddleOCR
 
-    # 创建全局 PaddleOCR 实例，只需初始化一次以节省资源
-    paddle_ocr = PaddleOCR(
-        use_angle_cls=True,  # 使用方向分类器
-        lang="ch",  # 中文识别
-        use_gpu=False,  # 不使用 GPU
-        show_log=False,  # 不显示日志
-    )
     PADDLE_AVAILABLE = True
 except ImportError:
+    PaddleOCR = None
     PADDLE_AVAILABLE = False
 
+from nonebot_plugin_noadpls.config import config
 from nonebot_plugin_noadpls.utils.cache import save_cache
 from nonebot_plugin_noadpls.utils.constants import PrefixConstants
 from nonebot_plugin_noadpls.utils.log import log
 
+from .preprocess import prepare_image
 
-def recognize_image(image_data: bytes, cache_key: Optional[str] = None) -> str:
+# 每个线程/进程各自持有一个 PaddleOCR 实例，实例不能在并发调用间共享
+_local = threading.local()
+
+# 提前结束识别用的检测函数和词库版本号，需在创建工作进程(fork)之前设置
+_early_exit: Optional[tuple[Callable[[str], bool], Callable[[], int]]] = None
+
+
+class PartialText(str):
+    """因已确认命中违禁词而提前结束识别的不完整结果，不写入缓存"""
+
+
+def set_early_exit(check: Callable[[str], bool], version: Callable[[], int]) -> None:
     """
-    使用PaddleOCR识别图像数据中的文字
+    设置逐块识别时用于提前结束的检测函数
 
     Args:
-        image_data: 图像的二进制数据
-        cache_key: 缓存键名，如果为None则使用图像数据的哈希值
+        check: 判断已识别的文本是否命中违禁词
+        version: 获取当前词库版本号，工作进程中的词库与任务提交时版本一致才会提前结束
+    """
+    global _early_exit
+    _early_exit = (check, version)
+
+
+def early_exit_version() -> Optional[int]:
+    """
+    获取提交识别任务时应携带的词库版本号
 
     Returns:
-        识别的文本内容，没有换行符
+        当前词库版本号，未设置提前结束时返回None
     """
-    if not PADDLE_AVAILABLE:
-        raise ImportError("PaddleOCR未安装或不可用，无法进行本地OCR识别")
+    return None if _early_exit is None else _early_exit[1]()
 
-    # 如果没有提供缓存键，使用图像数据的哈希值作为缓存键
-    if not cache_key:
-        cache_key = (
-            f"{PrefixConstants.OCR_RESULT_TEXT}{hashlib.sha512(image_data).hexdigest()}"
+
+def get_paddle_ocr() -> Any:
+    """获取当前线程的 PaddleOCR 实例，首次调用时创建"""
+    if PaddleOCR is None:
+        raise ImportError("PaddleOCR未安装或不可用，无法进行本地OCR识别")
+    paddle_ocr = getattr(_local, "paddle_ocr", None)
+    if paddle_ocr is None:
+        paddle_ocr = PaddleOCR(
+            use_angle_cls=True,  # 使用方向分类器
+            lang="ch",  # 中文识别
+            use_gpu=False,  # 不使用 GPU
+            show_log=False,  # 不显示日志
         )
+        _local.paddle_ocr = paddle_ocr
+    return paddle_ocr
 
-    # 将二进制数据转换为 PaddleOCR 可处理的格式
-    image = io.BytesIO(image_data)
-    pil_image = Image.open(image)
-    np_array = np.array(pil_image)
 
-    # 使用PaddleOCR识别图像
-    result = paddle_ocr.ocr(np_array)
+def preload_paddle_ocr() -> None:
+    """OCR 工作线程/进程启动时预先加载模型"""
+    if PADDLE_AVAILABLE:
+        get_paddle_ocr()
 
+
+def _parse_result(result) -> str:
+    """将 PaddleOCR 的返回结构拼接为文本"""
     # 提取识别的文本并拼接
     text = " "
 
@@ -79,8 +102,109 @@ def recognize_image(image_data: bytes, cache_key: Optional[str] = None) -> str:
     except Exception as e:
         log.error(f"本地处理OCR结果时出错: {e}")
 
+    return text
+
+
+def recognize_text(image_data: bytes, version: Optional[int] = None) -> str:
+    """
+    识别图像中的文字，不读写缓存，可在工作进程中执行
+
+    图像先经过预处理(缩小、灰度、长图切块)，再逐块交给 PaddleOCR；
+    指定词库版本号且与本进程中的词库一致时，每识别完一块就检测一次，
+    命中后不再识别剩余的块
+
+    Args:
+        image_data: 图像的二进制数据，为空时只加载模型(用于预热)
+        version: 提交任务时的词库版本号，None 表示不提前结束
+
+    Returns:
+        识别的文本内容，没有换行符；提前结束时为 PartialText
+
+    Raises:
+        ValueError: 图片超出解码像素数上限
+    """
+    paddle_ocr = get_paddle_ocr()
+    if not image_data:
+        return ""
+
+    # 将二进制数据转换为 PaddleOCR 可处理的格式
+    prepared = prepare_image(
+        image_data,
+        max_side=config.env.ocr_max_side,
+        max_tiles=config.env.ocr_max_tiles,
+        max_pixels=config.env.ocr_max_pixels,
+        grayscale=config.env.ocr_grayscale,
+    )
+
+    check = None
+    if _early_exit is not None and version is not None and len(prepared.tiles) > 1:
+        # 本进程的词库已过期时不能据此提前结束
+        if _early_exit[1]() == version:
+            check = _early_exit[0]
+
+    # 使用PaddleOCR识别图像，各块结果依次拼接
+    start = time.perf_counter()
+    parts = []
+    for index, tile in enumerate(prepared.tiles):
+        parts.append(_parse_result(paddle_ocr.ocr(tile)))
+        if check is not None and index < len(prepared.tiles) - 1:
+            text = " " + "".join(part[1:] for part in parts)
+            if check(text):
+                log.debug(
+                    f"第 {index + 1}/{len(prepared.tiles)} 块已命中，提前结束识别"
+                )
+                return PartialText(text)
+    elapsed = time.perf_counter() - start
+
+    # 识别耗时大致与像素数成正比，据此估算直接识别原图需要多花的时间
+    width, height = prepared.source_size
+    saved = elapsed * (width * height / prepared.output_pixels - 1)
+    saved -= prepared.elapsed
+    log.debug(
+        f"OCR预处理: {width}x{height} -> {len(prepared.tiles)}块 "
+        f"{prepared.output_pixels}像素，预处理 {prepared.elapsed * 1000:.1f}ms，"
+        f"识别 {elapsed * 1000:.1f}ms，预计节省 {saved * 1000:.1f}ms"
+    )
+    return " " + "".join(part[1:] for part in parts)
+
+
+def cache_ocr_text(
+    image_data: bytes, text: str, cache_key: Optional[str] = None
+) -> None:
+    """
+    缓存OCR结果，提前结束的不完整结果不缓存
+
+    Args:
+        image_data: 图像的二进制数据
+        text: 识别结果
+        cache_key: 缓存键名，如果为None则使用图像数据的哈希值
+    """
+    if isinstance(text, PartialText):
+        log.debug("OCR提前结束，结果不完整，不写入缓存")
+        return
+
+    # 如果没有提供缓存键，使用图像数据的哈希值作为缓存键
+    if not cache_key:
+        cache_key = (
+            f"{PrefixConstants.OCR_RESULT_TEXT}{hashlib.sha512(image_data).hexdigest()}"
+        )
+
     # 缓存结果
     save_cache(cache_key, text, PrefixConstants.OCR_CACHE_TTL)
     log.info(f"OCR结果已缓存: {cache_key}")
 
+
+def recognize_image(image_data: bytes, cache_key: Optional[str] = None) -> str:
+    """
+    使用PaddleOCR识别图像数据中的文字
+
+    Args:
+        image_data: 图像的二进制数据
+        cache_key: 缓存键名，如果为None则使用图像数据的哈希值
+
+    Returns:
+        识别的文本内容，没有换行符
+    """
+    text = recognize_text(image_data)
+    cache_ocr_text(image_data, text, cache_key)
     return text
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+from PIL import Image
+
+from .preprocess import DecodedImage
+
+# dHash 的边长，得到 HASH_SIZE * HASH_SIZE 位的哈希
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * HASH_SIZE
+# 用于确认相似图片的灰度缩略图边长
+THUMB_SIZE = 32
+# 缩略图对应像素允许的最大灰度差，重新编码的同一张图片通常只差 1~2
+THUMB_TOLERANCE = 8
+
+
+class ImageFingerprint(NamedTuple):
+    """图片指纹"""
+
+    hash: int
+    """64 位 dHash，用于快速查找候选"""
+    size: tuple[int, int]
+    """原图尺寸"""
+    thumbnail: bytes
+    """THUMB_SIZE x THUMB_SIZE 的灰度缩略图，用于确认候选"""
+
+
+def _dhash(thumbnail: Image.Image) -> int:
+    """在灰度缩略图上计算差值哈希"""
+    small = thumbnail.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            left = pixels[offset + col]
+            right = pixels[offset + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def fingerprint(decoded: DecodedImage) -> ImageFingerprint:
+    """
+    计算图片指纹
+
+    dHash 将图片缩放为 (HASH_SIZE + 1) x HASH_SIZE 的灰度图，逐行比较相邻像素的明暗，
+    重新编码后的同一张图片哈希只相差少数几位；但白底文字截图的 dHash 几乎都相同，
+    因此另外保存尺寸和缩略图，用于确认哈希相近的候选
+
+    Args:
+        decoded: decode_image 解码并缩小后的灰度图
+
+    Returns:
+        图片指纹
+    """
+    thumbnail = decoded.image.convert("L").resize(
+        (THUMB_SIZE, THUMB_SIZE), Image.Resampling.BOX
+    )
+    return ImageFingerprint(_dhash(thumbnail), decoded.source_size, thumbnail.tobytes())
+
+
+def same_image(a: ImageFingerprint, b: ImageFingerprint) -> bool:
+    """
+    确认两个指纹是否属于同一张图片
+
+    Args:
+        a: 图片指纹
+        b: 图片指纹
+
+    Returns:
+        尺寸相同且缩略图每个像素的灰度差都不超过 THUMB_TOLERANCE 时返回True
+    """
+    if a.size != b.size:
+        return False
+    difference = np.abs(
+        np.frombuffer(a.thumbnail, dtype=np.uint8).astype(np.int16)
+        - np.frombuffer(b.thumbnail, dtype=np.uint8)
+    )
+    return int(difference.max()) <= THUMB_TOLERANCE
+
+
+class ImageHashIndex:
+    """近期图片的感知哈希索引
+
+    按汉明距离查找相似图片并复用其 OCR 结果，哈希相近的候选还需通过
+    same_image 确认，避免不同的文字截图因哈希相同而误用结果
+
+    哈希被切成 max_distance + 1 段，由抽屉原理，距离不超过 max_distance 的
+    两个哈希至少有一段完全相同，查找时只需比较共享某一段的候选
+    """
+
+    def __init__(self, maxsize: int = 0, max_distance: int = 5, ttl: int = 86400):
+        """
+        初始化索引
+
+        Args:
+            maxsize: 最多记录的图片数，0 表示不记录
+            max_distance: 视为同一张图片的最大汉明距离
+            ttl: 记录的有效期(秒)
+        """
+        self.maxsize = maxsize
+        self.max_distance = min(max(0, max_distance), HASH_BITS - 1)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        bands = self.max_distance + 1
+        # 每一段的 (位移, 掩码)
+        self._bands: list[tuple[int, int]] = []
+        start = 0
+        for index in range(bands):
+            width = HASH_BITS // bands + (index < HASH_BITS % bands)
+            self._bands.append((start, (1 << width) - 1))
+            start += width
+        self._buckets: list[dict[int, set[ImageFingerprint]]] = [
+            {} for _ in self._bands
+        ]
+        # 指纹 -> (写入时间, OCR结果)
+        self._data: OrderedDict[ImageFingerprint, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _chunks(self, value: int) -> list[int]:
+        return [(value >> shift) & mask for shift, mask in self._bands]
+
+    def _discard(self, key: ImageFingerprint) -> None:
+        """删除一条记录，调用方持有锁"""
+        del self._data[key]
+        for bucket, chunk in zip(self._buckets, self._chunks(key.hash)):
+            members = bucket[chunk]
+            members.discard(key)
+            if not members:
+                del bucket[chunk]
+
+    def get(self, key: ImageFingerprint) -> Optional[str]:
+        """
+        查找相似图片的 OCR 结果
+
+        Args:
+            key: 图片指纹
+
+        Returns:
+            哈希距离最近且通过确认的相似图片的 OCR 结果，没有时返回None
+        """
+        if self.maxsize <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            best = None
+            best_distance = self.max_distance + 1
+            checked: set[ImageFingerprint] = set()
+            for bucket, chunk in zip(self._buckets, self._chunks(key.hash)):
+                for candidate in bucket.get(chunk, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    distance = bin(candidate.hash ^ key.hash).count("1")
+                    if distance < best_distance and same_image(candidate, key):
+                        best, best_distance = candidate, distance
+            if best is not None and now - self._data[best][0] > self.ttl:
+                self._discard(best)
+                best = None
+            if best is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(best)
+            self.hits += 1
+            return self._data[best][1]
+
+    def put(self, key: ImageFingerprint, text: str) -> None:
+        """
+        记录图片的 OCR 结果
+
+        Args:
+            key: 图片指纹
+            text: OCR 结果
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            self._data[key] = (time.time(), text)
+            for bucket, chunk in zip(self._buckets, self._chunks(key.hash)):
+                bucket.setdefault(chunk, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._discard(next(iter(self._data)))
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取索引统计信息
+
+        Returns:
+            包含记录数、命中次数等统计数据的字典
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "max_distance": self.max_distance,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,366 @@
+import asyncio
+import time
+from typing import Optional
+
+from nonebot_plugin_noadpls.config import config
+from nonebot_plugin_noadpls.detector import EXECUTION_MODES, CheckExecutor
+from nonebot_plugin_noadpls.utils.constants import PrefixConstants
+from nonebot_plugin_noadpls.utils.log import log
+
+from .api_ocr import api_paddle_ocr
+from .backends import OcrChain, OcrUnavailableError, fake_ocr, register_backend
+from .ocr import (
+    PADDLE_AVAILABLE,
+    PartialText,
+    cache_ocr_text,
+    early_exit_version,
+    preload_paddle_ocr,
+    recognize_text,
+)
+from .phash import ImageFingerprint, ImageHashIndex, fingerprint
+from .preprocess import DecodedImage, ImageTooLargeError, decode_image
+from .qr import CV2_AVAILABLE, DECODE_SIDE, QrScanner
+from .text_gate import THUMBNAIL_SIDE, TextGate
+
+ocr_mode = config.env.ocr_mode.lower()
+if ocr_mode not in EXECUTION_MODES:
+    log.warning(f"未知的OCR执行模式: {ocr_mode}，使用 thread")
+    ocr_mode = "thread"
+
+# 每个工作线程/进程启动时各自加载一个 PaddleOCR 实例
+ocr_executor = CheckExecutor(
+    recognize_text,
+    mode=ocr_mode,
+    max_workers=config.env.ocr_workers,
+    queue_size=config.env.ocr_queue_size,
+    initializer=preload_paddle_ocr,
+    timeout=config.env.ocr_timeout or None,
+)
+if ocr_executor.mode != ocr_mode:
+    log.warning(f"当前平台不支持 {ocr_mode} 模式，OCR使用 {ocr_executor.mode}")
+
+
+async def _run_ocr(image_data: bytes) -> str:
+    """将图片连同当前词库版本号交给工作池"""
+    return await ocr_executor.run(image_data, early_exit_version())
+
+
+class OcrEngineState:
+    """本地OCR引擎的加载状态"""
+
+    UNAVAILABLE = "unavailable"
+    "PaddleOCR 未安装"
+    IDLE = "idle"
+    "尚未开始加载"
+    LOADING = "loading"
+    "正在后台加载"
+    READY = "ready"
+    "加载完成"
+    FAILED = "failed"
+    "加载失败"
+
+
+class OcrEngineLoadingError(OcrUnavailableError):
+    """本地OCR模型正在加载，后端链中的其他后端都不可用，加载完成后可重新识别"""
+
+
+# 加载失败后重试的最长间隔(秒)
+WARM_UP_RETRY_MAX = 3600.0
+
+engine_state = OcrEngineState.IDLE if PADDLE_AVAILABLE else OcrEngineState.UNAVAILABLE
+_warm_up_task: Optional[asyncio.Task] = None
+# 连续加载失败的次数和最近一次失败的时间
+_load_failures = 0
+_failed_at = 0.0
+# 工作池重建的次数，加载过程中工作池被重建时加载结果作废
+_generation = 0
+
+
+def get_engine_state() -> str:
+    """获取本地OCR引擎的加载状态"""
+    return engine_state
+
+
+def local_ocr_ready() -> bool:
+    """
+    本地OCR引擎是否可以立即使用，尚未开始加载时在后台开始加载，
+    加载失败后等待一段时间(每次失败翻倍)再重新加载
+
+    Returns:
+        加载完成时返回True
+    """
+    global engine_state
+    if engine_state == OcrEngineState.FAILED:
+        retry_delay = min(
+            WARM_UP_RETRY_MAX,
+            config.env.ocr_warm_up_retry * 2 ** (_load_failures - 1),
+        )
+        if time.monotonic() - _failed_at >= retry_delay:
+            engine_state = OcrEngineState.IDLE
+    if engine_state == OcrEngineState.IDLE:
+        start_ocr_warm_up()
+    return engine_state == OcrEngineState.READY
+
+
+def start_ocr_warm_up() -> Optional[asyncio.Task]:
+    """
+    在后台开始加载本地OCR模型，不等待加载完成
+
+    Returns:
+        加载任务，PaddleOCR 不可用时返回None
+    """
+    global _warm_up_task, engine_state
+    if engine_state == OcrEngineState.IDLE:
+        engine_state = OcrEngineState.LOADING
+        _warm_up_task = asyncio.get_running_loop().create_task(_load_engine())
+    return _warm_up_task
+
+
+async def warm_up_ocr() -> None:
+    """加载本地OCR模型并等待加载完成"""
+    task = start_ocr_warm_up()
+    if task is not None:
+        await asyncio.shield(task)
+
+
+async def wait_ocr_engine() -> None:
+    """本地OCR模型正在加载时等待加载结束，不会开始新的加载"""
+    while engine_state == OcrEngineState.LOADING and _warm_up_task is not None:
+        await asyncio.shield(_warm_up_task)
+
+
+def refresh_ocr_workers() -> None:
+    """
+    词库更新后调用
+
+    process 模式下工作进程持有 fork 时的匹配结构，提前结束识别会使用旧词库，
+    重建进程池并在下次使用时重新加载模型，期间由其他OCR后端处理；
+    其他模式共享内存，无需处理
+    """
+    global engine_state, _generation
+    if ocr_executor.mode != "process":
+        return
+    _generation += 1
+    ocr_executor.restart()
+    if engine_state in (OcrEngineState.READY, OcrEngineState.LOADING):
+        engine_state = OcrEngineState.IDLE
+        log.info("词库已更新，OCR工作进程将重新创建")
+
+
+async def _load_engine() -> None:
+    """每个工作线程/进程各自加载一个模型实例
+
+    首次加载可能需要下载模型，不受单个OCR任务的超时限制，使用单独的 ocr_warm_up_timeout
+    """
+    global engine_state, _load_failures, _failed_at
+    start = time.perf_counter()
+    generation = _generation
+    try:
+        if ocr_executor.mode == "inline":
+            # inline 模式下只能在事件循环所在线程中加载
+            preload_paddle_ocr()
+        else:
+            # 同时提交与工作数相同的空任务，使每个工作线程/进程都执行一次初始化
+            await asyncio.gather(
+                *(
+                    ocr_executor.run(b"", timeout=config.env.ocr_warm_up_timeout)
+                    for _ in range(ocr_executor.max_workers)
+                )
+            )
+    except Exception as e:
+        if generation != _generation:
+            return
+        engine_state = OcrEngineState.FAILED
+        _load_failures += 1
+        _failed_at = time.monotonic()
+        log.error(f"本地OCR模型加载失败(第 {_load_failures} 次)，稍后重试: {e!r}")
+        return
+    if generation != _generation:
+        # 加载期间工作池已重建，新的工作池由下一次加载处理
+        return
+    engine_state = OcrEngineState.READY
+    _load_failures = 0
+    log.info(f"本地OCR模型加载完成，耗时 {time.perf_counter() - start:.1f}s")
+
+
+async def local_ocr_async(image_data: bytes, cache_key: Optional[str] = None) -> str:
+    """
+    在OCR工作池中识别图像，不阻塞事件循环
+
+    Args:
+        image_data: 图像的二进制数据
+        cache_key: 缓存键名，如果为None则使用图像数据的哈希值
+
+    Returns:
+        识别的文本内容
+
+    Raises:
+        ImportError: PaddleOCR 不可用
+        asyncio.TimeoutError: 识别超时
+    """
+    if not PADDLE_AVAILABLE:
+        raise ImportError("PaddleOCR未安装或不可用，无法进行本地OCR识别")
+    text = await _run_ocr(image_data)
+    cache_ocr_text(image_data, text, cache_key)
+    return text
+
+
+# 近期图片的感知哈希，重新编码或轻微裁剪后重发的图片直接复用OCR结果
+image_index = ImageHashIndex(
+    maxsize=config.env.ocr_phash_size,
+    max_distance=config.env.ocr_phash_distance,
+    ttl=PrefixConstants.OCR_CACHE_TTL,
+)
+
+
+async def find_similar_image(
+    decoded: Optional[DecodedImage],
+) -> tuple[Optional[ImageFingerprint], Optional[str]]:
+    """
+    在近期图片中查找相似图片
+
+    Args:
+        decoded: decode_image_async 解码的图片
+
+    Returns:
+        (图片指纹, 相似图片的OCR结果)，无法计算指纹时指纹为None，没有相似图片时结果为None
+    """
+    if image_index.maxsize <= 0 or decoded is None:
+        return None, None
+    try:
+        image_key = await asyncio.to_thread(fingerprint, decoded)
+    except Exception as e:
+        log.debug(f"计算图片指纹失败: {e!r}")
+        return None, None
+    return image_key, image_index.get(image_key)
+
+
+def remember_image(image_key: Optional[ImageFingerprint], text: str) -> None:
+    """
+    记录图片的OCR结果，供之后的相似图片复用，提前结束的不完整结果不记录
+
+    Args:
+        image_key: find_similar_image 返回的指纹
+        text: OCR结果
+    """
+    if image_key is not None and not isinstance(text, PartialText):
+        image_index.put(image_key, text)
+
+
+# 快速判断图片是否含有文字，不含文字的图片跳过完整OCR
+text_gate = TextGate(config.env.ocr_text_gate)
+
+
+async def may_contain_text(decoded: Optional[DecodedImage]) -> bool:
+    """
+    在线程中快速判断图片是否值得进行完整OCR
+
+    Args:
+        decoded: decode_image_async 解码的图片
+
+    Returns:
+        可能含有文字时返回True，无法解码的图片交给OCR自行处理
+    """
+    if text_gate.threshold <= 0 or decoded is None:
+        return True
+    return await asyncio.to_thread(text_gate.may_contain_text, decoded.image)
+
+
+# 二维码检测，通过定位图案筛选的图片才完整解码
+qr_scanner = QrScanner(config.env.qr_detect)
+if config.env.qr_detect and not CV2_AVAILABLE:
+    log.warning("OpenCV未安装或不可用，不进行二维码检测")
+
+
+async def scan_qr_codes(decoded: Optional[DecodedImage]) -> str:
+    """
+    在线程中检测并解码图片中的二维码
+
+    Args:
+        decoded: decode_image_async 解码的图片
+
+    Returns:
+        二维码内容拼接的文本，格式与OCR结果相同，没有二维码或无法解码时为 " "
+    """
+    if not qr_scanner.enabled or decoded is None:
+        return " "
+    payloads = await asyncio.to_thread(qr_scanner.scan, decoded.image)
+    if payloads:
+        log.debug(f"二维码内容: {payloads}")
+    return " " + "".join(f"{payload} " for payload in payloads)
+
+
+async def decode_image_async(image_data: bytes) -> Optional[DecodedImage]:
+    """
+    在线程中解码图片，相似图片查找、文字判断和二维码检测共用这一次解码
+
+    JPEG 按所需尺寸直接缩小解码，解码像素数受 ocr_max_pixels 限制
+
+    Args:
+        image_data: 图像的二进制数据
+
+    Returns:
+        缩小后的灰度图，以上分析都未启用或无法识别图片时返回None
+
+    Raises:
+        ImageTooLargeError: 解码像素数超出上限
+    """
+    if qr_scanner.enabled:
+        max_side = DECODE_SIDE
+    elif text_gate.threshold > 0 or image_index.maxsize > 0:
+        max_side = THUMBNAIL_SIDE
+    else:
+        return None
+    try:
+        return await asyncio.to_thread(
+            decode_image, image_data, max_side, config.env.ocr_max_pixels
+        )
+    except ImageTooLargeError:
+        raise
+    except Exception as e:
+        log.debug(f"解码图片失败: {e!r}")
+        return None
+
+
+async def _local_backend(image_data: bytes) -> str:
+    """本地 PaddleOCR 后端，交给OCR工作池"""
+    return await _run_ocr(image_data)
+
+
+# 模型加载完成前跳过本地后端，由链上的其他后端处理
+register_backend("local", _local_backend, available=local_ocr_ready)
+register_backend("online", api_paddle_ocr)
+register_backend("fake", fake_ocr)
+
+# 按配置顺序尝试的OCR后端链
+ocr_chain = OcrChain(
+    config.env.ocr_backends,
+    failure_threshold=config.env.ocr_breaker_failures,
+    reset_timeout=config.env.ocr_breaker_reset,
+    slow_threshold=config.env.ocr_slow_threshold,
+)
+
+
+async def chain_ocr(image_data: bytes, cache_key: Optional[str] = None) -> str:
+    """
+    按后端链识别图像并缓存结果
+
+    Args:
+        image_data: 图像的二进制数据
+        cache_key: 缓存键名，如果为None则使用图像数据的哈希值
+
+    Returns:
+        识别的文本内容
+
+    Raises:
+        OcrEngineLoadingError: 本地OCR模型正在加载，其他后端都不可用
+        OcrUnavailableError: 没有可用的后端或全部失败
+    """
+    try:
+        text = await ocr_chain.recognize(image_data)
+    except OcrUnavailableError as e:
+        if engine_state == OcrEngineState.LOADING and "local" in ocr_chain.names:
+            raise OcrEngineLoadingError(str(e)) from e
+        raise
+    cache_ocr_text(image_data, text, cache_key)
+    return text
@@ -0,0 +1,150 @@
+import io
+import time
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image
+
+# 高度超过宽度的这么多倍视为长图，按宽度缩放后切块
+TALL_RATIO = 2
+# 相邻切块的重叠比例，避免文字行恰好被切断
+TILE_OVERLAP = 0.1
+
+
+class ImageTooLargeError(ValueError):
+    """图片解码像素数超出上限"""
+
+
+class DecodedImage(NamedTuple):
+    """解码并缩小后的图像"""
+
+    image: Image.Image
+    """缩小后的图像"""
+    source_size: tuple[int, int]
+    """原图尺寸"""
+
+
+class PreparedImage(NamedTuple):
+    """预处理后交给 OCR 的图像"""
+
+    tiles: list[np.ndarray]
+    """切块后的图像数组，普通图片只有一块"""
+    source_size: tuple[int, int]
+    """原图尺寸"""
+    output_pixels: int
+    """所有切块的像素总数"""
+    elapsed: float
+    """预处理耗时(秒)"""
+
+
+def _tile_tops(height: int, tile_height: int, max_tiles: int) -> list[int]:
+    """计算各切块的上边界，超出数量上限时均匀抽样"""
+    if tile_height <= 0 or height <= tile_height:
+        return [0]
+    step = max(1, int(tile_height * (1 - TILE_OVERLAP)))
+    tops = [*range(0, height - tile_height, step), height - tile_height]
+    if max_tiles > 0 and len(tops) > max_tiles:
+        if max_tiles == 1:
+            return tops[:1]
+        last = len(tops) - 1
+        tops = [tops[round(i * last / (max_tiles - 1))] for i in range(max_tiles)]
+    return tops
+
+
+def decode_image(
+    image_data: bytes,
+    max_side: int = 1600,
+    max_pixels: int = 50_000_000,
+    grayscale: bool = True,
+    tall_by_width: bool = False,
+) -> DecodedImage:
+    """
+    解码并缩小图像
+
+    JPEG 直接以缩小后的尺寸解码(draft 模式)，其他格式解码后再缩放；
+    解码前检查像素数，避免解压炸弹占满内存
+
+    Args:
+        image_data: 图像的二进制数据
+        max_side: 缩放后的最长边，0 表示不缩放
+        max_pixels: 解码像素数上限，超出时拒绝处理
+        grayscale: 是否转换为灰度图
+        tall_by_width: 长图是否按宽度(而不是最长边)缩放
+
+    Returns:
+        缩小后的图像
+
+    Raises:
+        ImageTooLargeError: 解码像素数超出上限
+        PIL.UnidentifiedImageError: 无法识别的图像
+    """
+    image = Image.open(io.BytesIO(image_data))
+    width, height = image.size
+    tall = height > width * TALL_RATIO
+    side = width if tall and tall_by_width else max(width, height)
+    scale = min(1.0, max_side / side) if max_side > 0 and side else 1.0
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    mode = "L" if grayscale else "RGB"
+
+    if scale < 1:
+        # 只有 JPEG 支持，解码尺寸不小于 target
+        image.draft(mode, target)
+    if image.width * image.height > max_pixels > 0:
+        raise ImageTooLargeError(
+            f"图片解码尺寸 {image.width}x{image.height} 超出上限 {max_pixels} 像素"
+        )
+
+    image = image.convert(mode)
+    if image.size != target:
+        image = image.resize(target, Image.Resampling.BILINEAR, reducing_gap=3.0)
+    return DecodedImage(image, (width, height))
+
+
+def prepare_image(
+    image_data: bytes,
+    max_side: int = 1600,
+    max_tiles: int = 8,
+    max_pixels: int = 50_000_000,
+    grayscale: bool = True,
+) -> PreparedImage:
+    """
+    解码并缩小图像，长图切块
+
+    长图按宽度缩放后沿高度切成互相重叠的块，块数超出上限时均匀抽样
+
+    Args:
+        image_data: 图像的二进制数据
+        max_side: 缩放后的最长边(长图为宽度)，0 表示不缩放
+        max_tiles: 长图最多切出的块数，0 表示不限制
+        max_pixels: 解码像素数上限，超出时拒绝处理
+        grayscale: 是否转换为灰度图
+
+    Returns:
+        预处理后的图像
+
+    Raises:
+        ImageTooLargeError: 解码像素数超出上限
+        PIL.UnidentifiedImageError: 无法识别的图像
+    """
+    start = time.perf_counter()
+    image, (width, height) = decode_image(
+        image_data, max_side, max_pixels, grayscale, tall_by_width=True
+    )
+    target = image.size
+    tall = height > width * TALL_RATIO
+
+    tile_height = max_side if tall else 0
+    tops = _tile_tops(target[1], tile_height, max_tiles)
+    if len(tops) == 1:
+        tiles = [np.asarray(image)]
+    else:
+        tiles = [
+            np.asarray(image.crop((0, top, target[0], top + tile_height)))
+            for top in tops
+        ]
+    return PreparedImage(
+        tiles=tiles,
+        source_size=(width, height),
+        output_pixels=sum(tile.shape[0] * tile.shape[1] for tile in tiles),
+        elapsed=time.perf_counter() - start,
+    )
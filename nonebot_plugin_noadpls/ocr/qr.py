@@ -0,0 +1,247 @@
+import threading
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    CV2_AVAILABLE = False
+
+# 查找定位图案时缩略图的最大像素数
+SCAN_PIXELS = 640 * 640
+# 解码时的最长边，传入的图片应至少缩小到该尺寸
+DECODE_SIDE = 1600
+# 定位图案沿一条直线的深浅比例
+FINDER_RATIO = np.array([1, 1, 3, 1, 1])
+# 各段宽度允许偏离理论值的比例
+FINDER_TOLERANCE = 0.5
+# 缩略图中模块(二维码的最小方格)的最小宽度，更细的片段多为噪点或文字笔画
+MIN_MODULE = 1.5
+# 定位图案至少要在几行中被确认
+MIN_FINDER_ROWS = 2
+# 至少找到几个定位图案才视为可能含有二维码(每个二维码有三个)
+MIN_FINDERS = 2
+
+
+def _otsu_threshold(pixels: np.ndarray) -> float:
+    """
+    用大津法计算灰度图的二值化阈值
+
+    Args:
+        pixels: 灰度图数组
+
+    Returns:
+        使深浅两类的类间方差最大的灰度值
+    """
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    weight = np.cumsum(histogram)
+    total = weight[-1]
+    moment = np.cumsum(histogram * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_dark = moment / weight
+        mean_light = (moment[-1] - moment) / (total - weight)
+        between = weight * (total - weight) * (mean_dark - mean_light) ** 2
+    return float(np.nanargmax(between[:-1]))
+
+
+def _finder_runs(dark: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    在二值图的每一行中查找深浅比例为 1:1:3:1:1 的片段
+
+    所有行的游程一次算出，不逐行循环
+
+    Args:
+        dark: 二维布尔数组，True 为深色
+
+    Returns:
+        (所在行, 中心位置, 模块宽度) 三个等长数组
+    """
+    height, width = dark.shape
+    change = np.ones(dark.shape, dtype=bool)
+    change[:, 1:] = dark[:, 1:] != dark[:, :-1]
+    starts = np.flatnonzero(change)
+    empty = np.empty(0)
+    if starts.size < 5:
+        return empty, empty, empty
+    runs = np.diff(np.append(starts, height * width))
+    rows = starts // width
+    windows = sliding_window_view(runs, 5)
+    module = windows.sum(axis=1) / 7
+    first = np.arange(len(windows))
+    # 先用廉价的条件筛掉大部分片段，只对剩下的检查比例
+    index = np.flatnonzero(
+        dark.ravel()[starts[first]]
+        & (rows[first] == rows[first + 4])
+        & (module >= MIN_MODULE)
+    )
+    expected = module[index, None] * FINDER_RATIO
+    index = index[
+        np.all(np.abs(windows[index] - expected) < expected * FINDER_TOLERANCE, axis=1)
+    ]
+    center = starts[index + 2] - rows[index] * width + runs[index + 2] / 2
+    return rows[index], center, module[index]
+
+
+def find_finder_patterns(dark: np.ndarray) -> list[tuple[float, float, float]]:
+    """
+    查找二维码的定位图案(回字形方块)
+
+    分别在行和列中查找 1:1:3:1:1 的深浅片段，两个方向在同一位置都出现时才确认，
+    相近的中心合并为一个，只保留在多行中都被确认的
+
+    Args:
+        dark: 二维布尔数组，True 为深色
+
+    Returns:
+        (x, y, 模块宽度) 列表
+    """
+    columns: dict[int, list[tuple[float, float]]] = {}
+    for x, center_y, module in zip(*_finder_runs(dark.T)):
+        columns.setdefault(int(x), []).append((center_y, module))
+
+    found: list[list[float]] = []
+    for y, center_x, module in zip(*_finder_runs(dark)):
+        confirmed = any(
+            abs(center_y - y) < module and 0.5 < module / column_module < 2
+            for center_y, column_module in columns.get(int(center_x), ())
+        )
+        if not confirmed:
+            continue
+        for finder in found:
+            if (
+                abs(center_x - finder[0]) < module * 3
+                and abs(y - finder[1]) < module * 3
+            ):
+                finder[3] += 1
+                break
+        else:
+            found.append([float(center_x), float(y), float(module), 1])
+    return [(x, y, module) for x, y, module, rows in found if rows >= MIN_FINDER_ROWS]
+
+
+def has_finder_patterns(image: Image.Image, min_finders: int = MIN_FINDERS) -> bool:
+    """
+    快速判断图片是否可能含有二维码
+
+    在缩小后的灰度图上查找定位图案，只有找到足够多的图片才需要完整解码
+
+    Args:
+        image: 解码并缩小后的灰度图
+        min_finders: 至少需要的定位图案数
+
+    Returns:
+        可能含有二维码时返回True
+    """
+    width, height = image.size
+    scale = min(1.0, (SCAN_PIXELS / max(1, width * height)) ** 0.5)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    gray = image.convert("L")
+    if gray.size != size:
+        gray = gray.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(gray)
+    if int(pixels.max()) - int(pixels.min()) < 64:
+        # 没有足够的明暗对比
+        return False
+    dark = pixels <= _otsu_threshold(pixels)
+    return len(find_finder_patterns(dark)) >= min_finders
+
+
+def decode_qr_codes(image: Image.Image, max_side: int = DECODE_SIDE) -> list[str]:
+    """
+    解码图片中的所有二维码
+
+    Args:
+        image: 解码并缩小后的灰度图
+        max_side: 最长边超过该值时先缩小
+
+    Returns:
+        二维码内容列表，没有可解码的二维码时为空
+
+    Raises:
+        ImportError: OpenCV 不可用
+    """
+    if cv2 is None:
+        raise ImportError("OpenCV未安装或不可用，无法解码二维码")
+    gray = image.convert("L")
+    if max(gray.size) > max_side:
+        gray.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+    pixels = np.asarray(gray)
+    detector = cv2.QRCodeDetector()
+    try:
+        ok, payloads, _, _ = detector.detectAndDecodeMulti(pixels)
+        if not ok or not any(payloads):
+            # 多码检测失败时再按单个二维码检测一次
+            payload, _, _ = detector.detectAndDecode(pixels)
+            payloads = (payload,)
+    except cv2.error:
+        return []
+    return [payload for payload in payloads if payload]
+
+
+class QrScanner:
+    """二维码检测
+
+    先用定位图案快速筛选，只对可能含有二维码的图片完整解码；
+    OpenCV 不可用时不检测
+    """
+
+    def __init__(self, enabled: bool = True, min_finders: int = MIN_FINDERS) -> None:
+        """
+        初始化
+
+        Args:
+            enabled: 是否启用
+            min_finders: 至少找到几个定位图案才解码
+        """
+        self.enabled = enabled and CV2_AVAILABLE
+        self.min_finders = min_finders
+        self.checked = 0
+        self.candidates = 0
+        self.decoded = 0
+        self._lock = threading.Lock()
+
+    def scan(self, image: Image.Image) -> list[str]:
+        """
+        检测并解码图片中的二维码
+
+        Args:
+            image: 解码并缩小后的灰度图
+
+        Returns:
+            二维码内容列表，没有二维码或未启用时为空
+        """
+        if not self.enabled:
+            return []
+        try:
+            candidate = has_finder_patterns(image, self.min_finders)
+            payloads = decode_qr_codes(image) if candidate else []
+        except Exception:
+            candidate, payloads = False, []
+        with self._lock:
+            self.checked += 1
+            if candidate:
+                self.candidates += 1
+            if payloads:
+                self.decoded += 1
+        return payloads
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            包含检查次数、通过筛选次数和成功解码次数的字典
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "checked": self.checked,
+                "candidates": self.candidates,
+                "decoded": self.decoded,
+            }
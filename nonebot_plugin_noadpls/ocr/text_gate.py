@@ -0,0 +1,109 @@
+import threading
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+# 缩略图的最大边长
+THUMBNAIL_SIDE = 512
+# 统计局部密度的方格边长
+CELL_SIZE = 32
+# 视为笔画边缘的相邻像素灰度差
+EDGE_CONTRAST = 48
+
+
+def stroke_density(image: Image.Image) -> float:
+    """
+    估计图像中的文字笔画密度
+
+    在灰度缩略图上按方格统计水平方向对比度强烈的边缘所占比例并取最大值，
+    文字由大量细而锐利的笔画组成，即使只有一小行，所在方格的比例也明显高于
+    照片和表情图
+
+    长图几乎都是截图，缩小后笔画也难以分辨，不做判断直接视为含有文字
+
+    Args:
+        image: 解码并缩小后的灰度图
+
+    Returns:
+        最密集方格中的强边缘像素比例，0 到 1 之间
+    """
+    width, height = image.size
+    if height > width * 2:
+        return 1.0
+    side = max(width, height)
+    scale = min(1.0, THUMBNAIL_SIDE / side) if side else 1.0
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    gray = image.convert("L")
+    if gray.size != size:
+        gray = gray.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(gray, dtype=np.int16)
+    if pixels.shape[1] < 2:
+        return 0.0
+    edges = np.abs(np.diff(pixels, axis=1)) > EDGE_CONTRAST
+    rows = -(-edges.shape[0] // CELL_SIZE)
+    cols = -(-edges.shape[1] // CELL_SIZE)
+    # 补齐到整数个方格后按方格求和
+    padded = np.zeros((rows * CELL_SIZE, cols * CELL_SIZE), dtype=np.uint16)
+    padded[: edges.shape[0], : edges.shape[1]] = edges
+    counts = padded.reshape(rows, CELL_SIZE, cols, CELL_SIZE).sum(axis=(1, 3))
+    return float(counts.max()) / (CELL_SIZE * CELL_SIZE)
+
+
+class TextGate:
+    """OCR 前的快速文字判断
+
+    笔画密度低于阈值的图片视为不含文字，跳过完整 OCR；
+    判断出错时交给 OCR 处理
+    """
+
+    def __init__(self, threshold: float = 0.01) -> None:
+        """
+        初始化
+
+        Args:
+            threshold: 笔画密度阈值，越小越灵敏(跳过的图片越少)，0 表示不跳过
+        """
+        self.threshold = threshold
+        self.checked = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def may_contain_text(self, image: Image.Image) -> bool:
+        """
+        判断图片是否值得进行完整 OCR
+
+        Args:
+            image: 解码并缩小后的灰度图
+
+        Returns:
+            可能含有文字时返回True
+        """
+        if self.threshold <= 0:
+            return True
+        try:
+            passed = stroke_density(image) >= self.threshold
+        except Exception:
+            passed = True
+        with self._lock:
+            self.checked += 1
+            if not passed:
+                self.skipped += 1
+        return passed
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            包含检查次数、跳过次数等统计数据的字典
+        """
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "skip_rate": (
+                    round(self.skipped / self.checked, 4) if self.checked else 0.0
+                ),
+            }
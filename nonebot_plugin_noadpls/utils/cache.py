@@ -3,8 +3,10 @@ import json
 import os
 import shutil
 import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, BinaryIO, Optional, Union
 
 from .constants import StoragePathConstants
 from .log import log
@@ -111,6 +113,46 @@ class CacheManager:
                 os.remove(cache_path)
             return cache_path
 
+    @contextmanager
+    def open_binary(
+        self, file_name: str, ttl: Optional[int] = None
+    ) -> Iterator[BinaryIO]:
+        """
+        以流的方式写入二进制缓存
+
+        内容先写入临时文件，正常退出时连同元数据一起生效，
+        出现异常时删除临时文件，已有的缓存保持不变
+
+        Args:
+            file_name: 缓存文件标识
+            ttl: 缓存有效期（单位：秒），默认使用初始化时设置的值
+
+        Yields:
+            可写入的二进制文件对象
+        """
+        cache_path = self._get_cache_path(file_name)
+        tmp_path = cache_path.with_suffix(".tmp")
+        ttl = ttl if ttl is not None else self.default_ttl
+        try:
+            with open(tmp_path, "wb") as f:
+                yield f
+            # 保存元数据
+            with open(cache_path.with_suffix(".meta"), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "file_name": file_name,
+                        "timestamp": time.time(),
+                        "expires_at": time.time() + ttl,
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(tmp_path, cache_path)
+            log.debug(f"缓存成功保存: {file_name}")
+        finally:
+            if tmp_path.exists():
+                os.remove(tmp_path)
+
     def load(
         self, file_name: str, default: Any = None, remove_if_expired: bool = True
     ) -> Any:
@@ -373,6 +415,13 @@ def save_cache(file_name: str, content: Any, ttl: Optional[int] = None) -> Path:
     return default_cache.save(file_name, content, ttl)
 
 
+def open_binary_cache(
+    file_name: str, ttl: Optional[int] = None
+) -> AbstractContextManager[BinaryIO]:
+    """以流的方式写入默认缓存"""
+    return default_cache.open_binary(file_name, ttl)
+
+
 def load_cache(file_name: str, default: Any = None) -> Any:
     """从默认缓存加载内容"""
     return default_cache.load(file_name, default)
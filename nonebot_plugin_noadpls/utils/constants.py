@@ -17,6 +17,8 @@ class StoragePathConstants:
         DATA_PATH: LocalStore提供插件数据保存路径
         DATA_FILE: 可变数据文件
         CACHE_PATH: LocalStore提供插件缓存保存路径
+        DETECTOR_SNAPSHOT_FILE: 检测结构快照文件
+        JIEBA_CACHE_PATH: jieba 词典缓存目录
     """
 
     # Config相关路径
@@ -38,6 +40,10 @@ class StoragePathConstants:
     # Cache相关路径
     CACHE_PATH = store.get_plugin_cache_dir()
     "LocalStore提供插件缓存保存路径"
+    DETECTOR_SNAPSHOT_FILE = CACHE_PATH / "detector_snapshot.pkl"
+    "检测结构快照文件"
+    JIEBA_CACHE_PATH = CACHE_PATH / "jieba"
+    "jieba 词典缓存目录"
 
 
 class PrefixConstants:
@@ -65,7 +71,12 @@ class PrefixConstants:
     "OCR结果文字缓存前缀"
     OCR_RESULT_IMAGE = "ocr_result_image_"
     "OCR结果图片缓存前缀"
+    QR_RESULT_TEXT = "qr_result_text_"
+    "二维码内容缓存前缀"
     OCR_CACHE_TTL = 86400
     "定义缓存有效期（1天）"
+    OCR_SKIP_CACHE_TTL = 600
+    "判定为不含文字而跳过OCR的结果的缓存有效期（10分钟），误判时不会长时间沿用"
 
     BAN_PRE_TEXT_REGEX = "re:"
+    BAN_DOMAIN = "domain:"
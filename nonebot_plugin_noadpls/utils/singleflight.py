@@ -0,0 +1,79 @@
+import asyncio
+from collections.abc import Awaitable, Hashable
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """合并同一个键上的并发任务
+
+    同一时间对同一个键只执行一次，其余调用方等待同一个结果；
+    任务在独立的 Task 中执行，个别调用方被取消不影响其他调用方，
+    所有调用方都被取消后任务随之取消
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[T]] = {}
+        self._waiters: dict[asyncio.Task[T], int] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行任务，同一个键上已有任务在执行时直接等待其结果
+
+        Args:
+            key: 任务的键
+            factory: 创建任务的函数，只在没有进行中的任务时调用
+
+        Returns:
+            任务的结果
+
+        Raises:
+            Exception: 任务抛出的异常，所有等待方都会收到
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters[task] - 1
+            if remaining:
+                self._waiters[task] = remaining
+            else:
+                del self._waiters[task]
+
+    def _done(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        """任务结束后移除，并取走异常，避免所有等待方都已取消时产生警告"""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取统计信息
+
+        Returns:
+            包含进行中任务数、实际执行次数和合并次数的字典
+        """
+        return {
+            "in_flight": len(self._tasks),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
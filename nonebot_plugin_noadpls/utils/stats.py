@@ -0,0 +1,19 @@
+import math
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    最近秩法计算分位数
+
+    Args:
+        samples: 样本
+        q: 分位(0-1)
+
+    Returns:
+        排序后第 ceil(q * n) 个样本，没有样本时返回0
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(q * len(ordered)) - 1)
+    return ordered[index]
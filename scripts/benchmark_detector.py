@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+违禁词检测基准脚本
+
+对比 cleanse_speech.DLFA 逐层检测与自动机单次扫描的耗时，并校验两者结果一致；
+分别给出原文层、预处理后文本层和两层合计的耗时，词库越大，自动机的优势越小
+
+用法: python scripts/benchmark_detector.py [--rounds N] [--libraries advertisement,general]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nonebot
+
+# 允许直接在仓库根目录下运行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CLEAN_SAMPLES = [
+    "今天天气不错，我们一起去公园玩吧",
+    "顺便讨论一下项目的进度和下周的安排",
+    "hello everyone, lets meet at 5pm",
+    "这个版本的更新日志写得很清楚",
+    "晚上吃什么？火锅还是烧烤",
+]
+SPAM_SAMPLES = [
+    "群主好，有兼职需要的加微信",
+    "代.理 招聘 日结 详情私聊",
+    "淘宝刷单，一单一结，扣扣联系",
+]
+
+
+def bootstrap(libraries: list[str]) -> None:
+    """初始化 NoneBot 并加载插件"""
+    tmp = Path(tempfile.mkdtemp(prefix="noadpls_bench_"))
+    nonebot.init(
+        driver="~none",
+        log_level="WARNING",
+        noadpls={"ban_pre_text": libraries},
+        localstore_cache_dir=str(tmp / "cache"),
+        localstore_data_dir=str(tmp / "data"),
+        localstore_config_dir=str(tmp / "config"),
+    )
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    nonebot.get_driver().register_adapter(Adapter)
+    nonebot.load_plugin("nonebot_plugin_noadpls")
+
+
+def build_corpus(size: int, seed: int = 0) -> list[str]:
+    """生成混合了干净消息和广告消息的语料"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        parts = rng.choices(CLEAN_SAMPLES, k=rng.randint(1, 6))
+        if rng.random() < 0.1:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(SPAM_SAMPLES))
+        corpus.append("".join(parts))
+    return corpus
+
+
+def timed(func, corpus: list, rounds: int) -> tuple[float, list]:
+    """返回每条消息的平均耗时(微秒)和最后一轮的结果"""
+    results = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [func(text) for text in corpus]
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(corpus)) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--libraries", default="advertisement")
+    args = parser.parse_args()
+
+    bootstrap(args.libraries.split(","))
+
+    from cleanse_speech import DLFA
+
+    from nonebot_plugin_noadpls import ban_judge
+
+    dfa = DLFA(words_resource=[*ban_judge.pre_text_list, ban_judge.normal_words])
+
+    # 预处理不属于本次对比范围，提前算好
+    def legacy_exact(pair: tuple[str, str]) -> list:
+        text, processed_text = pair
+        result = dfa.extract_illegal_words(text)
+        if result:
+            return result
+        if processed_text != text:
+            return dfa.extract_illegal_words(processed_text)
+        return []
+
+    def automaton_exact(pair: tuple[str, str]) -> list:
+        text, processed_text = pair
+        segments = [text] if processed_text == text else [text, processed_text]
+        for words in ban_judge.matchers.automaton.extract_many(segments):
+            if words:
+                return words
+        return []
+
+    def legacy_layer(text: str) -> list:
+        return dfa.extract_illegal_words(text)
+
+    def automaton_layer(text: str) -> list:
+        return ban_judge.matchers.automaton.extract_many([text])[0]
+
+    corpus = [
+        (text, ban_judge.preprocess_text(text)) for text in build_corpus(args.size)
+    ]
+    raw_texts = [text for text, _ in corpus]
+    processed_texts = [processed_text for _, processed_text in corpus]
+
+    # (名称, DLFA, 自动机, 语料)，逐层分别计时并校验结果
+    layers = [
+        ("原文", legacy_layer, automaton_layer, raw_texts),
+        ("预处理后", legacy_layer, automaton_layer, processed_texts),
+        ("两层合计", legacy_exact, automaton_exact, corpus),
+    ]
+
+    print(f"词库: {args.libraries} ({len(ban_judge.matchers.automaton)} 个词)")  # noqa: T201
+    for name, legacy, automaton, texts in layers:
+        legacy_us, legacy_results = timed(legacy, texts, args.rounds)
+        new_us, new_results = timed(automaton, texts, args.rounds)
+        if legacy_results != new_results:
+            print(f"{name}: 结果不一致!")  # noqa: T201
+            sys.exit(1)
+        print(  # noqa: T201
+            f"{name}: DLFA {legacy_us:.1f} us/条，自动机 {new_us:.1f} us/条，"
+            f"加速比 {legacy_us / new_us:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+检测流水线基准脚本
+
+在固定种子生成的干净/广告语料(短、中、长三种长度)上，
+对不同词库组合和不同数量的 re: 规则分别测量:
+
+- preprocess: 文本预处理
+- exact: 原始/预处理文本的精确匹配
+- fuzzy: 分词 + 模糊匹配
+- regex: 正则规则匹配
+- check_text: 完整检测(不使用结果缓存)
+
+输出各层 p50/p99 延迟以及 check_text 的吞吐量(条/秒)。
+指定 --baseline 时与基准结果比较，--metrics 中的指标变慢或吞吐量下降超过 --threshold
+即以非零状态退出(p99 受机器抖动影响较大，默认不参与比较)。
+
+用法:
+    python scripts/benchmark_pipeline.py --save-baseline bench.json
+    python scripts/benchmark_pipeline.py --baseline bench.json --threshold 0.2
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import nonebot
+
+# 允许直接在仓库根目录下运行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_COMBOS = (
+    "advertisement;"
+    "advertisement,general;"
+    "advertisement,pornographic;"
+    "advertisement,politics;"
+    "advertisement,general,netease,politics,pornographic"
+)
+LAYERS = ("preprocess", "exact", "fuzzy", "regex", "check_text")
+LENGTHS = {"short": (8, 30), "medium": (60, 200), "long": (400, 1200)}
+
+CLEAN_SAMPLES = [
+    "今天天气不错，我们一起去公园玩吧",
+    "顺便讨论一下项目的进度和下周的安排",
+    "hello everyone, lets meet at 5pm",
+    "这个版本的更新日志写得很清楚",
+    "晚上吃什么？火锅还是烧烤",
+    "周末有人一起打球吗",
+    "刚看完那部电影，结局有点意外",
+    "记得明天早上九点开会",
+]
+SPAM_SAMPLES = [
+    "群主好，有兼职需要的加微信",
+    "代.理 招聘 日结 详情私聊",
+    "淘宝刷单，一单一结，扣扣联系",
+    "低价出售游戏账号，联系Q号 12345678",
+    "免费领取会员，点击链接 http://example.com/abc",
+    "ｖ❤ 信 搜 索 领 红 包",
+]
+
+
+def bootstrap() -> None:
+    """初始化 NoneBot 并加载插件，关闭结果缓存和快照以测量真实耗时"""
+    tmp = Path(tempfile.mkdtemp(prefix="noadpls_bench_"))
+    nonebot.init(
+        driver="~none",
+        log_level="WARNING",
+        noadpls={
+            "ban_pre_text": ["advertisement"],
+            "verdict_cache_size": 0,
+            "normalize_cache_size": 0,
+            "detector_snapshot": False,
+            "check_mode": "inline",
+        },
+        localstore_cache_dir=str(tmp / "cache"),
+        localstore_data_dir=str(tmp / "data"),
+        localstore_config_dir=str(tmp / "config"),
+    )
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    nonebot.get_driver().register_adapter(Adapter)
+    nonebot.load_plugin("nonebot_plugin_noadpls")
+
+
+def build_corpus(kind: str, length: str, size: int, seed: int) -> list[str]:
+    """生成指定类型和长度的语料"""
+    rng = random.Random(f"{seed}-{kind}-{length}")
+    low, high = LENGTHS[length]
+    corpus = []
+    for _ in range(size):
+        target = rng.randint(low, high)
+        text = ""
+        while len(text) < target:
+            text += rng.choice(CLEAN_SAMPLES)
+        text = text[:target]
+        if kind == "spam":
+            pos = rng.randint(0, len(text))
+            text = text[:pos] + rng.choice(SPAM_SAMPLES) + text[pos:]
+        corpus.append(text)
+    return corpus
+
+
+def build_rules(count: int, seed: int) -> list[str]:
+    """生成指定数量的 re: 规则，混合有字面量和无字面量的写法"""
+    rng = random.Random(f"{seed}-rules")
+    templates = [
+        r"re:加.{{0,3}}{word}",
+        r"re:{word}\d{{3,}}",
+        r"re:[qQ扣]{{1,2}}.?{word}",
+        r"re:(?:{word}|{other})群",
+        r"re:\d{{{n},}}",
+    ]
+    words = ["微信", "兼职", "刷单", "代理", "返利", "红包", "会员", "账号"]
+    rules = []
+    for index in range(count):
+        template = templates[index % len(templates)]
+        rule = template.format(
+            word=rng.choice(words), other=rng.choice(words), n=5 + index % 7
+        )
+        rules.append(f"{rule}(?#{index})")
+    return rules
+
+
+def measure(func: Callable[[str], object], corpus: list[str]) -> list[float]:
+    """逐条计时，返回每条的耗时(微秒)"""
+    samples = []
+    for text in corpus:
+        start = time.perf_counter_ns()
+        func(text)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return samples
+
+
+def configure(libraries: list[str], rules: list[str]) -> None:
+    """切换词库组合和正则规则"""
+    from nonebot_plugin_noadpls import ban_judge
+
+    ban_judge.config.env.ban_pre_text = libraries
+    if rules:
+        ban_judge.update_words(new_words=rules, reload_library=True)
+    else:
+        ban_judge.update_words(
+            remove_words=list(ban_judge.config.local.ban_text), reload_library=True
+        )
+    # 预先构建模糊索引，避免首条消息计入构建耗时
+    ban_judge.fuzzy_match_check("预热")
+
+
+def run_case(corpus: list[str]) -> dict[str, dict[str, float]]:
+    """对一组语料测量各层耗时"""
+    from nonebot_plugin_noadpls import ban_judge
+    from nonebot_plugin_noadpls.utils.stats import percentile
+
+    current = ban_judge.matchers
+    processed = {text: ban_judge.preprocess_text(text) for text in corpus}
+
+    def exact(text: str) -> object:
+        processed_text = processed[text]
+        segments = [text] if processed_text == text else [text, processed_text]
+        return current.automaton.extract_many(segments)
+
+    funcs = {
+        "preprocess": ban_judge.preprocess_text,
+        "exact": exact,
+        "fuzzy": lambda text: ban_judge.fuzzy_match_check(processed[text]),
+        "regex": ban_judge.regex_match_check,
+        "check_text": ban_judge.check_text,
+    }
+    # 预热一轮，排除首次调用的初始化耗时
+    for text in corpus:
+        ban_judge.check_text(text)
+
+    report = {}
+    for layer in LAYERS:
+        samples = measure(funcs[layer], corpus)
+        report[layer] = {
+            "p50_us": round(percentile(samples, 0.5), 1),
+            "p99_us": round(percentile(samples, 0.99), 1),
+        }
+    total = sum(measure(ban_judge.check_text, corpus))
+    report["check_text"]["msgs_per_sec"] = round(len(corpus) / (total / 1e6), 1)
+    return report
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float,
+    metrics: set[str],
+) -> list[str]:
+    """返回超过阈值的退化项"""
+    regressions = []
+    for case, layers in results.items():
+        for layer, metrics_of_layer in layers.items():
+            base = baseline.get(case, {}).get(layer)
+            if not base:
+                continue
+            for metric, value in metrics_of_layer.items():
+                old = base.get(metric)
+                if metric not in metrics or not old:
+                    continue
+                if metric == "msgs_per_sec":
+                    change = (old - value) / old
+                else:
+                    change = (value - old) / old
+                if change > threshold:
+                    regressions.append(
+                        f"{case} {layer} {metric}: {old} -> {value} ({change:+.0%})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size", type=int, default=200, help="每组语料的消息数")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--combos", default=DEFAULT_COMBOS, help="词库组合，组合间用;分隔"
+    )
+    parser.add_argument("--rules", default="0,10,100", help="re: 规则数量列表")
+    parser.add_argument("--baseline", type=Path, help="用于比较的基准结果文件")
+    parser.add_argument("--save-baseline", type=Path, help="将本次结果保存为基准")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="允许的最大退化比例"
+    )
+    parser.add_argument(
+        "--metrics",
+        default="p50_us,msgs_per_sec",
+        help="参与比较的指标，可选 p50_us,p99_us,msgs_per_sec",
+    )
+    args = parser.parse_args()
+
+    bootstrap()
+
+    corpora = {
+        f"{kind}-{length}": build_corpus(kind, length, args.size, args.seed)
+        for kind in ("clean", "spam")
+        for length in LENGTHS
+    }
+    results: dict[str, dict] = {}
+    for combo in args.combos.split(";"):
+        libraries = combo.split(",")
+        for count in (int(n) for n in args.rules.split(",")):
+            configure(libraries, build_rules(count, args.seed))
+            for name, corpus in corpora.items():
+                case = f"{combo}|rules={count}|{name}"
+                results[case] = run_case(corpus)
+                row = results[case]
+                print(  # noqa: T201
+                    f"{case}\n  "
+                    + "  ".join(
+                        f"{layer} {row[layer]['p50_us']}/{row[layer]['p99_us']}us"
+                        for layer in LAYERS
+                    )
+                    + f"  {row['check_text']['msgs_per_sec']} 条/秒"
+                )
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        print(f"基准结果已保存: {args.save_baseline}")  # noqa: T201
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(
+            results, baseline, args.threshold, set(args.metrics.split(","))
+        )
+        if regressions:
+            print(f"性能退化超过 {args.threshold:.0%}:")  # noqa: T201
+            for line in regressions:
+                print(f"  {line}")  # noqa: T201
+            sys.exit(1)
+        print("未发现超过阈值的性能退化")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
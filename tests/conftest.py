@@ -0,0 +1,20 @@
+import tempfile
+from pathlib import Path
+
+import nonebot
+import pytest
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """初始化 NoneBot 并加载插件，数据目录放在临时目录中"""
+    tmp = Path(tempfile.mkdtemp(prefix="noadpls_test_"))
+    nonebot.init(
+        driver="~none",
+        localstore_cache_dir=str(tmp / "cache"),
+        localstore_data_dir=str(tmp / "data"),
+        localstore_config_dir=str(tmp / "config"),
+    )
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    nonebot.get_driver().register_adapter(Adapter)
+    nonebot.load_plugin("nonebot_plugin_noadpls")
@@ -0,0 +1,20 @@
+import pytest
+
+from nonebot_plugin_noadpls.utils.stats import percentile
+
+
+@pytest.mark.parametrize(
+    ("samples", "q", "expected"),
+    [
+        (list(range(1, 101)), 0.99, 99),
+        (list(range(1, 101)), 0.5, 50),
+        (list(range(1, 101)), 1.0, 100),
+        ([6, 1, 5, 2, 4, 3], 0.5, 3),
+        ([6, 1, 5, 2, 4, 3], 0.0, 1),
+        ([1, 2, 3, 4, 5], 0.5, 3),
+        ([7], 0.99, 7),
+        ([], 0.5, 0.0),
+    ],
+)
+def test_percentile_nearest_rank(samples: list[float], q: float, expected: float):
+    assert percentile(samples, q) == expected